@@ -6,126 +6,153 @@ import time  # --- PERUBAHAN ---: Import modul time
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QLabel, QPushButton, QVBoxLayout, QHBoxLayout,
     QFileDialog, QListWidget, QListWidgetItem, QSlider, QGroupBox, QFormLayout, 
-    QSpinBox, QFrame, QDoubleSpinBox, QScrollArea, QComboBox
+    QSpinBox, QFrame, QDoubleSpinBox, QScrollArea, QComboBox, QCheckBox, QProgressDialog
 )
-from PySide6.QtCore import Qt, QThread, Signal
+from PySide6.QtCore import Qt, QThread, QTimer, Signal
 from PySide6.QtGui import QPixmap, QImage, QFont
-from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
-
-METHODS = [
-    "Image Negative",
-    "Grayscale",
-    "Histogram Equalization",
-    "Threshold (Binary)",
-    "Blurring/Smoothing",
-    "Edge Detection",  # Menggabungkan berbagai jenis edge detection
-    "Morphology (Open)",
-    "Morphology (Close)",
-    "Dilation",
-    "Erosion",
-    "Brightness/Contrast Adjustment",
-    "Sharpen / Contrast"
-]
-
-METHOD_DESCRIPTIONS = {
-    "Image Negative": "Membalik nilai piksel (Invert)",
-    "Grayscale": "Konversi gambar ke skala abu-abu",
-    "Histogram Equalization": "Pemerataan histogram standar",
-    "Threshold (Binary)": "Konversi ke gambar biner hitam-putih",
-    "Blurring/Smoothing": "Berbagai teknik blur dan smoothing gambar",
-    "Edge Detection": "Berbagai teknik deteksi tepi pada gambar",
-    "Morphology (Open)": "Operasi morfologi opening",
-    "Morphology (Close)": "Operasi morfologi closing",
-    "Dilation": "Operasi dilasi (memperbesar objek)",
-    "Erosion": "Operasi erosi (memperkecil objek)",
-    "Brightness/Contrast Adjustment": "Penyesuaian brightness dan contrast",
-    "Sharpen / Contrast": "Penajaman dan peningkatan kontras"
-}
-
-def qimg_from_cv(img):
-    """Convert an OpenCV image (BGR or gray) to QImage"""
+
+from scheduling import LatestSlot
+from pipeline import Pipeline
+from cache import ResultCache, content_hash
+from proxy import make_proxy, scale_spec
+from video import open_source
+from profiling import Profiler
+from governor import QualityGovernor
+from incremental import IncrementalProcessor
+from capture import BACKENDS, CaptureConfig, format_settings, open_capture
+from engine import (
+    METHODS, METHOD_DESCRIPTIONS, BLUR_ENGINES, BLUR_TYPES, EDGE_TYPES, MORPH_SHAPES, PRECISIONS,
+    ProcessSpec, live_spec, spec_label, read_image, write_image,
+)
+
+# Batas memori cache hasil (byte)
+RESULT_CACHE_BYTES = 512 * 1024 * 1024
+# Jendela penggabungan perubahan parameter pada mode live preview
+LIVE_DEBOUNCE_MS = 120
+
+def pixmap_from_cv(img, width, height):
+    """Fit an OpenCV image into width x height and convert it to QPixmap.
+
+    The image is resized with cv2 first, so the cost depends on the label size
+    rather than on the source resolution. The QImage wraps the resized array
+    directly (BGR888, no cvtColor); QPixmap.fromImage makes the only copy.
+    """
     if img is None:
         return None
-    if len(img.shape) == 2:  # grayscale
-        h, w = img.shape
-        bytes_per_line = w
-        return QImage(img.data, w, h, bytes_per_line, QImage.Format_Grayscale8).copy()
-    else:
-        h, w, ch = img.shape
-        rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        bytes_per_line = 3 * w
-        return QImage(rgb.data, w, h, bytes_per_line, QImage.Format_RGB888).copy()
-
-class HistogramCanvas(FigureCanvas):
-    def __init__(self, parent=None, width=4, height=2, dpi=100):
-        fig = Figure(figsize=(width, height), dpi=dpi)
-        super().__init__(fig)
-        self.ax = fig.add_subplot(111)
-        self.ax.set_facecolor('#f8f9fa')
-        fig.patch.set_facecolor('#f8f9fa')
-        fig.tight_layout()
-
-    def plot_hist(self, img, per_channel=True):
-        self.ax.clear()
-        if img is None:
-            self.ax.text(0.5, 0.5, 'No Image', horizontalalignment='center', 
-                         verticalalignment='center', transform=self.ax.transAxes,
-                         fontsize=12, color='gray')
-            self.ax.set_xlim(0, 1)
-            self.ax.set_ylim(0, 1)
-            self.ax.set_xticks([])
-            self.ax.set_yticks([])
-            self.draw()
+    h, w = img.shape[:2]
+    scale = min(width / w, height / h)
+    if scale != 1.0:
+        size = (max(1, round(w * scale)), max(1, round(h * scale)))
+        interp = cv2.INTER_AREA if scale < 1.0 else cv2.INTER_LINEAR
+        img = cv2.resize(img, size, interpolation=interp)
+    img = np.ascontiguousarray(img)
+    h, w = img.shape[:2]
+    fmt = QImage.Format_Grayscale8 if img.ndim == 2 else QImage.Format_BGR888
+    return QPixmap.fromImage(QImage(img.data, w, h, img.strides[0], fmt))
+
+class LazyHistogram(QWidget):
+    """Placeholder that creates the matplotlib HistogramCanvas on the first real histogram.
+
+    Until an image is shown only a "No Image" label is displayed, so
+    matplotlib is not imported at startup.
+    """
+
+    def __init__(self, parent=None, width=4, height=2):
+        super().__init__(parent)
+        self._figsize = (width, height)
+        self.canvas = None
+        self._layout = QVBoxLayout(self)
+        self._layout.setContentsMargins(0, 0, 0, 0)
+        self._placeholder = QLabel("No Image")
+        self._placeholder.setAlignment(Qt.AlignCenter)
+        self._placeholder.setStyleSheet("background-color: #f8f9fa; color: gray; font-size: 12pt;")
+        self._layout.addWidget(self._placeholder)
+
+    def _ensure_canvas(self):
+        if self.canvas is None:
+            from histogram_canvas import HistogramCanvas
+            self.canvas = HistogramCanvas(self, *self._figsize)
+            self._layout.replaceWidget(self._placeholder, self.canvas)
+            self._placeholder.deleteLater()
+            self._placeholder = None
+        return self.canvas
+
+    def plot_hist(self, img, per_channel=True, data=None):
+        if img is None and self.canvas is None:
             return
-        
-        if len(img.shape) == 2 or not per_channel:
-            # grayscale histogram
-            gray = img if len(img.shape) == 2 else cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-            self.ax.hist(gray.ravel(), bins=256, range=(0,255), color='#495057', alpha=0.7)
-            self.ax.set_title("Grayscale Histogram", fontsize=10, fontweight='bold', color='#343a40')
-        else:
-            # color histogram per channel
-            chans = cv2.split(img)
-            colors = ('#4285f4', '#34a853', '#ea4335')  # Blue, Green, Red
-            labels = ('Blue', 'Green', 'Red')
-            for ch, col, lbl in zip(chans, colors, labels):
-                self.ax.hist(ch.ravel(), bins=256, range=(0,255), alpha=0.7, color=col, label=lbl)
-            self.ax.legend(fontsize=8, loc='upper right')
-            self.ax.set_title("Color Histogram", fontsize=10, fontweight='bold', color='#343a40')
-        
-        self.ax.set_xlim(0, 255)
-        self.ax.grid(True, alpha=0.3)
-        self.ax.set_facecolor('#f8f9fa')
-        self.ax.tick_params(axis='both', which='major', labelsize=8, colors='#343a40')
-        self.draw()
+        self._ensure_canvas().plot_hist(img, per_channel, data)
+
+    def plot_bins(self, bins, mode):
+        self._ensure_canvas().plot_bins(bins, mode)
 
 # Worker thread untuk mengambil frame kamera
 class CameraThread(QThread):
     frame_ready = Signal(np.ndarray)
+    opened = Signal(dict)
+    # Sumber berhenti sendiri (akhir file video, gagal dibuka, kamera lepas)
+    ended = Signal()
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, source=0, profiler=None):
         super().__init__(parent)
+        # source: CaptureConfig, indeks kamera, atau path video / urutan gambar
+        if isinstance(source, int):
+            source = CaptureConfig(device=source)
+        self.source = source
+        self.profiler = profiler or Profiler()
+        # Callable opsional; kalau False, frame hanya di-grab() tanpa decode
+        self.wants_frame = None
+        # Callable opsional yang menerima frame langsung di thread kamera,
+        # menggantikan sinyal frame_ready
+        self.on_frame = None
+        self.skipped = 0
         self.is_running = False
         self.cap = None
 
+    @property
+    def is_camera(self):
+        return isinstance(self.source, CaptureConfig)
+
     def run(self):
-        self.cap = cv2.VideoCapture(0)
+        if self.is_camera:
+            self.cap, granted = open_capture(self.source)
+        else:
+            self.cap, granted = open_source(self.source), {}
         if not self.cap.isOpened():
             print("Error: Tidak dapat membuka kamera.")
+            self.ended.emit()
             return
+        if granted:
+            print(f"Camera opened: {format_settings(granted)}")
+            self.opened.emit(granted)
+        skip_decode = self.is_camera and self.source.skip_decode and self.wants_frame is not None
 
+        # File video dibaca secepat decode; beri jeda sesuai FPS aslinya
+        interval = 0.0 if self.is_camera else 1.0 / (self.cap.get(cv2.CAP_PROP_FPS) or 30.0)
+        next_time = time.perf_counter()
         self.is_running = True
         while self.is_running and self.cap.isOpened():
-            ret, frame = self.cap.read()
-            if ret:
-                self.frame_ready.emit(frame)
-            else:
+            with self.profiler.stage("capture"):
+                if skip_decode and not self.wants_frame():
+                    # Worker masih sibuk: buang frame dari buffer driver tanpa decode
+                    ret, frame = self.cap.grab(), None
+                else:
+                    ret, frame = self.cap.read()
+            if not ret:
                 self.is_running = False
+            elif frame is None:
+                self.skipped += 1
+            elif self.on_frame is not None:
+                self.on_frame(frame)
+            else:
+                self.frame_ready.emit(frame)
+            if interval:
+                next_time += interval
+                time.sleep(max(0.0, next_time - time.perf_counter()))
         
         if self.cap:
             self.cap.release()
         print("Camera thread stopped.")
+        self.ended.emit()
 
     def stop(self):
         self.is_running = False
@@ -133,6 +160,148 @@ class CameraThread(QThread):
         if self.cap:
             self.cap.release()
             
+# Worker thread untuk memproses frame kamera di luar GUI thread
+class ProcessingThread(QThread):
+    """Processes camera frames through a latest-frame-wins mailbox.
+
+    Frames that arrive while a frame is being processed replace each other in
+    ``inbox``; finished results go to ``outbox`` the same way, so the GUI only
+    ever picks up the newest result.
+    """
+    result_ready = Signal()
+
+    def __init__(self, stages, parent=None, mirror=True, profiler=None):
+        super().__init__(parent)
+        self.stages = stages
+        self.mirror = mirror
+        self.profiler = profiler or Profiler()
+        self.pipeline = Pipeline()
+        self.inbox = LatestSlot()
+        self.outbox = LatestSlot()
+        self._busy = False
+        # QualityGovernor dan IncrementalProcessor opsional; diganti dari GUI
+        # thread, dibaca sekali per frame
+        self.governor = None
+        self.incremental = None
+
+    def ready_for_frame(self):
+        """True when a new frame would be processed right away instead of waiting"""
+        return not self._busy and not self.inbox.pending
+
+    def submit(self, frame):
+        # Waktu tiba frame dipakai untuk mengukur latensi capture -> display
+        self.inbox.put((frame, time.perf_counter()))
+
+    @property
+    def dropped(self):
+        return self.inbox.dropped + self.outbox.dropped
+
+    def run(self):
+        while True:
+            item = self.inbox.get()
+            if item is None:
+                break
+            self._busy = True
+            frame, t_capture = item
+            if self.mirror:
+                with self.profiler.stage("flip"):
+                    frame = cv2.flip(frame, 1)
+            try:
+                with self.profiler.stage("process"):
+                    result = self._process(frame)
+            except Exception as e:
+                print(f"Error applying pipeline: {e}")
+                result = frame.copy()
+            # None = scene tidak berubah: hasil yang ditampilkan tetap berlaku
+            if result is not None:
+                self.outbox.put((frame, result, t_capture))
+            self._busy = False
+            self.result_ready.emit()
+        print("Processing thread stopped.")
+
+    def _process(self, frame):
+        # Kamera: engine blur auto boleh memakai aproksimasi cepat
+        stages = tuple(live_spec(s) for s in self.stages)
+        governor = self.governor
+        if governor is None:
+            def run_full(f):
+                self.pipeline.set_stages(stages)
+                return self.pipeline.run(f)
+        else:
+            def run_full(f):
+                return governor.process(self.pipeline, f, stages)
+        incremental = self.incremental
+        if incremental is None:
+            return run_full(frame)
+        # Governor mengubah resolusi proses, jadi tile tidak bisa ditempel
+        return incremental.process(frame, stages, run_full, regions=governor is None)
+
+    def stop(self):
+        self.inbox.close()
+        self.wait()
+
+# Worker thread untuk render resolusi penuh di background
+class RenderThread(QThread):
+    """Runs a pipeline on the full-resolution image, reporting per-stage progress"""
+    progress = Signal(int, int)
+    rendered = Signal(object)
+
+    def __init__(self, img, specs, parent=None):
+        super().__init__(parent)
+        self.img = img
+        self.specs = specs
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    def run(self):
+        try:
+            result = Pipeline(self.specs).run(
+                self.img, should_cancel=lambda: self.cancelled, progress=self.progress.emit)
+        except Exception as e:
+            print(f"Error rendering full resolution: {e}")
+            result = None
+        self.rendered.emit(result)
+
+
+class PreviewThread(QThread):
+    """Background worker for live preview: only the newest job is computed.
+
+    Jobs go through a LatestSlot, so parameter sets submitted while a job is
+    running replace each other. The running job is abandoned at the next
+    stage boundary once a newer one is waiting.
+    """
+    computed = Signal(int, object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.inbox = LatestSlot()
+        self.pipeline = Pipeline()
+
+    def submit(self, generation, img, specs):
+        self.inbox.put((generation, img, specs))
+
+    def run(self):
+        while True:
+            job = self.inbox.get()
+            if job is None:
+                break
+            generation, img, specs = job
+            try:
+                self.pipeline.set_stages(specs)
+                result = self.pipeline.run(img, should_cancel=lambda: self.inbox.pending)
+            except Exception as e:
+                print(f"Error applying pipeline: {e}")
+                continue
+            if result is not None:
+                self.computed.emit(generation, result)
+
+    def stop(self):
+        self.inbox.close()
+        self.wait()
+
+
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -141,11 +310,37 @@ class MainWindow(QMainWindow):
         self.result = None
         
         self.cam_thread = None
+        self.proc_thread = None
         self.is_cam_running = False
-        self.is_processing = False
         
-        # --- PERUBAHAN ---: Tambahkan pelacak waktu untuk histogram
-        self.last_hist_update_time = 0
+        # Parameter diambil sekali setiap ada perubahan widget, bukan setiap frame
+        self.spec = ProcessSpec()
+        # Tahap-tahap pipeline yang sudah ditambahkan; self.spec adalah tahap terakhir
+        self.stages = []
+        self.pipeline = Pipeline()
+        
+        # Cache hasil untuk gambar diam: (hash isi gambar, daftar spec) -> hasil
+        self.result_cache = ResultCache(RESULT_CACHE_BYTES)
+        self.orig_key = None
+        
+        # Proxy resolusi rendah untuk preview; render penuh saat save
+        self.proxy = None
+        self.proxy_scale = 1.0
+        self._proxy_src = None
+        self.result_is_proxy = False
+        self.render_thread = None
+        
+        # Live preview: perubahan parameter digabung oleh timer, dihitung di
+        # PreviewThread; hasil dengan generation lama diabaikan
+        self.preview_thread = None
+        self.live_generation = 0
+        self._live_job = None
+        self.live_timer = QTimer(self)
+        self.live_timer.setSingleShot(True)
+        self.live_timer.setInterval(LIVE_DEBOUNCE_MS)
+        self.live_timer.timeout.connect(self._run_live_preview)
+        
+        self.profiler = Profiler()
         
         self._setup_ui()
 
@@ -208,6 +403,7 @@ class MainWindow(QMainWindow):
         self.btn_load = QPushButton("📁 Load Image")
         self.btn_start_cam = QPushButton("📸 Start Camera")
         self.btn_stop_cam = QPushButton("⏹️ Stop Camera")
+        self.btn_open_video = QPushButton("🎞️ Open Video")
         self.btn_save = QPushButton("💾 Save Result")
         self.btn_reset = QPushButton("🔄 Reset")
         
@@ -238,27 +434,117 @@ class MainWindow(QMainWindow):
         """
 
         self.btn_load.setStyleSheet(btn_style)
+        self.btn_open_video.setStyleSheet(btn_style)
         self.btn_save.setStyleSheet(btn_style)
         self.btn_reset.setStyleSheet(btn_style)
         self.btn_start_cam.setStyleSheet(start_cam_style)
         self.btn_stop_cam.setStyleSheet(stop_cam_style)
 
         self.btn_load.clicked.connect(self.load_image)
-        self.btn_start_cam.clicked.connect(self.start_camera)
+        self.btn_start_cam.clicked.connect(lambda: self.start_camera(self.capture_config()))
+        self.btn_open_video.clicked.connect(self.open_video)
         self.btn_stop_cam.clicked.connect(self.stop_camera)
         self.btn_save.clicked.connect(self.save_result)
         self.btn_reset.clicked.connect(self.reset)
         
         file_layout.addWidget(self.btn_load)
+        file_layout.addWidget(self.btn_open_video)
         cam_layout = QHBoxLayout()
         cam_layout.addWidget(self.btn_start_cam)
         cam_layout.addWidget(self.btn_stop_cam)
         file_layout.addLayout(cam_layout)
+        
+        # Statistik waktu per tahap (opsional, hampir tanpa overhead saat mati)
+        stats_layout = QHBoxLayout()
+        self.chk_stats = QCheckBox("📊 Show Stats")
+        self.chk_stats.setStyleSheet("color: #343a40; font-weight: bold;")
+        self.chk_stats.toggled.connect(self.toggle_stats)
+        self.btn_export_trace = QPushButton("Export Trace")
+        self.btn_export_trace.setStyleSheet(btn_style)
+        self.btn_export_trace.clicked.connect(self.export_trace)
+        stats_layout.addWidget(self.chk_stats)
+        stats_layout.addWidget(self.btn_export_trace)
+        file_layout.addLayout(stats_layout)
         file_layout.addWidget(self.btn_save)
         file_layout.addWidget(self.btn_reset)
+        
+        self.chk_proxy = QCheckBox("Proxy preview (large images)")
+        self.chk_proxy.setChecked(True)
+        self.chk_proxy.setStyleSheet("color: #343a40; font-weight: bold;")
+        self.chk_proxy.toggled.connect(lambda _: self.apply_and_update())
+        self.btn_render_full = QPushButton("🖼️ Render Full Resolution")
+        self.btn_render_full.setStyleSheet(btn_style)
+        self.btn_render_full.clicked.connect(lambda: self.render_full_resolution())
+        self.chk_live = QCheckBox("Live preview (apply while editing)")
+        self.chk_live.setStyleSheet(self.chk_proxy.styleSheet())
+        self.chk_live.toggled.connect(self.toggle_live_preview)
+        file_layout.addWidget(self.chk_proxy)
+        file_layout.addWidget(self.chk_live)
+        file_layout.addWidget(self.btn_render_full)
         file_group.setLayout(file_layout)
         left_layout.addWidget(file_group)
         
+        # Camera Settings Group
+        cam_group = QGroupBox("📷 Camera Settings")
+        cam_group.setStyleSheet(file_group.styleSheet())
+        cam_form = QFormLayout()
+        combo_style = "QComboBox { border: 1px solid #ced4da; border-radius: 5px; padding: 5px; background-color: #ffffff; color: #343a40; font-weight: bold; }"
+        spin_style = "QSpinBox { border: 1px solid #ced4da; border-radius: 5px; padding: 5px; background-color: #ffffff; color: #343a40; font-weight: bold; }"
+        self.spin_device = QSpinBox()
+        self.spin_device.setRange(0, 9)
+        self.spin_device.setStyleSheet(spin_style)
+        self.backend_combo = QComboBox()
+        self.backend_combo.addItems(list(BACKENDS))
+        self.backend_combo.setStyleSheet(combo_style)
+        self.resolution_combo = QComboBox()
+        self.resolution_combo.addItems(["Default", "640x480", "1280x720", "1920x1080"])
+        self.resolution_combo.setStyleSheet(combo_style)
+        self.spin_fps = QSpinBox()
+        self.spin_fps.setRange(0, 120)
+        self.spin_fps.setSpecialValueText("Default")
+        self.spin_fps.setStyleSheet(spin_style)
+        self.fourcc_combo = QComboBox()
+        self.fourcc_combo.addItems(["Default", "MJPG", "YUYV", "H264"])
+        self.fourcc_combo.setStyleSheet(combo_style)
+        self.spin_buffer = QSpinBox()
+        self.spin_buffer.setRange(0, 10)
+        self.spin_buffer.setValue(1)
+        self.spin_buffer.setSpecialValueText("Default")
+        self.spin_buffer.setStyleSheet(spin_style)
+        self.chk_skip_decode = QCheckBox("Skip decoding frames that would be dropped")
+        self.chk_skip_decode.setChecked(True)
+        self.chk_skip_decode.setStyleSheet("color: #343a40; font-weight: bold;")
+        # Governor: turunkan resolusi proses / pakai engine cepat agar target FPS tercapai
+        self.chk_governor = QCheckBox("Adaptive quality (hold target FPS)")
+        self.chk_governor.setStyleSheet(self.chk_skip_decode.styleSheet())
+        self.chk_governor.toggled.connect(self.update_governor)
+        # Deteksi perubahan: frame diam tidak diproses, hanya tile yang berubah
+        self.chk_incremental = QCheckBox("Skip unchanged frames / regions")
+        self.chk_incremental.setStyleSheet(self.chk_skip_decode.styleSheet())
+        self.chk_incremental.toggled.connect(self.update_incremental)
+        self.spin_change_thresh = QSpinBox()
+        self.spin_change_thresh.setRange(1, 64)
+        self.spin_change_thresh.setValue(8)
+        self.spin_change_thresh.setToolTip("Minimum change (0-255, per channel) of a downsampled pixel")
+        self.spin_change_thresh.setStyleSheet(spin_style)
+        self.spin_change_thresh.valueChanged.connect(self.update_incremental)
+        self.spin_target_fps = QSpinBox()
+        self.spin_target_fps.setRange(5, 120)
+        self.spin_target_fps.setValue(30)
+        self.spin_target_fps.setStyleSheet(spin_style)
+        self.spin_target_fps.valueChanged.connect(self.update_governor)
+        for text, widget in (("Device:", self.spin_device), ("Backend:", self.backend_combo),
+                             ("Resolution:", self.resolution_combo), ("FPS:", self.spin_fps),
+                             ("FOURCC:", self.fourcc_combo), ("Buffer Size:", self.spin_buffer)):
+            label = QLabel(text)
+            label.setStyleSheet("color: #343a40; font-weight: bold;")
+            cam_form.addRow(label, widget)
+        cam_form.addRow(self.chk_skip_decode)
+        cam_form.addRow(self.chk_governor, self.spin_target_fps)
+        cam_form.addRow(self.chk_incremental, self.spin_change_thresh)
+        cam_group.setLayout(cam_form)
+        left_layout.addWidget(cam_group)
+        
         self.btn_stop_cam.setEnabled(False)
         
         # Processing Methods Group
@@ -313,10 +599,18 @@ class MainWindow(QMainWindow):
         blur_type_label = QLabel("Blur Type:")
         blur_type_label.setStyleSheet("color: #343a40; font-weight: bold;")
         self.blur_type_combo = QComboBox()
-        self.blur_type_combo.addItems(["Gaussian Blur", "Median Blur", "Mean Blur", "Bilateral Filter"])
+        self.blur_type_combo.addItems(BLUR_TYPES)
         self.blur_type_combo.setStyleSheet("QComboBox { border: 1px solid #ced4da; border-radius: 5px; padding: 5px; background-color: #ffffff; color: #343a40; font-weight: bold; }")
         blur_type_layout.addWidget(blur_type_label)
         blur_type_layout.addWidget(self.blur_type_combo)
+        self.blur_engine_combo = QComboBox()
+        self.blur_engine_combo.addItems(BLUR_ENGINES)
+        self.blur_engine_combo.setToolTip(
+            "Median/Bilateral. exact = OpenCV; fast = downscaled approximation, ~10-20x faster "
+            "but up to ~140 levels off at edges (PSNR ~27-33 dB); auto = fast for large kernels "
+            "on the camera only, exact for still images, renders and saves")
+        self.blur_engine_combo.setStyleSheet(self.blur_type_combo.styleSheet())
+        blur_type_layout.addWidget(self.blur_engine_combo)
         self.param_layout.addWidget(self.blur_type_widget)
         
         # Edge Detection Type ComboBox
@@ -325,7 +619,7 @@ class MainWindow(QMainWindow):
         edge_type_label = QLabel("Edge Type:")
         edge_type_label.setStyleSheet("color: #343a40; font-weight: bold;")
         self.edge_type_combo = QComboBox()
-        self.edge_type_combo.addItems(["Canny", "Sobel", "Laplacian"])
+        self.edge_type_combo.addItems(EDGE_TYPES)
         self.edge_type_combo.setStyleSheet("QComboBox { border: 1px solid #ced4da; border-radius: 5px; padding: 5px; background-color: #ffffff; color: #343a40; font-weight: bold; }")
         edge_type_layout.addWidget(edge_type_label)
         edge_type_layout.addWidget(self.edge_type_combo)
@@ -441,6 +735,54 @@ class MainWindow(QMainWindow):
         thresh_layout.addWidget(self.spin_thresh)
         self.param_layout.addWidget(self.thresh_widget)
         
+        # Morphology Parameters (Dilation, Erosion, Opening, Closing)
+        self.morph_widget = QWidget()
+        morph_layout = QVBoxLayout(self.morph_widget)
+        morph_shape_widget = QWidget()
+        morph_shape_layout = QHBoxLayout(morph_shape_widget)
+        morph_shape_label = QLabel("Element:")
+        morph_shape_label.setStyleSheet("color: #343a40; font-weight: bold;")
+        self.morph_shape_combo = QComboBox()
+        self.morph_shape_combo.addItems(MORPH_SHAPES)
+        self.morph_shape_combo.setStyleSheet(self.blur_type_combo.styleSheet())
+        morph_shape_layout.addWidget(morph_shape_label)
+        morph_shape_layout.addWidget(self.morph_shape_combo)
+        morph_layout.addWidget(morph_shape_widget)
+        morph_size_widget = QWidget()
+        morph_size_layout = QHBoxLayout(morph_size_widget)
+        morph_size_label = QLabel("Size:")
+        morph_size_label.setStyleSheet("color: #343a40; font-weight: bold;")
+        self.morph_size_slider = QSlider(Qt.Horizontal)
+        self.morph_size_slider.setRange(1, 99)
+        self.morph_size_slider.setValue(3)
+        self.morph_size_value = QLabel("3")
+        self.morph_size_value.setStyleSheet("font-weight: bold; color: #343a40;")
+        self.morph_size_slider.valueChanged.connect(lambda v: self.morph_size_value.setText(str(v)))
+        morph_size_layout.addWidget(morph_size_label)
+        morph_size_layout.addWidget(self.morph_size_slider)
+        morph_size_layout.addWidget(self.morph_size_value)
+        morph_layout.addWidget(morph_size_widget)
+        morph_iter_widget = QWidget()
+        morph_iter_layout = QHBoxLayout(morph_iter_widget)
+        morph_iter_label = QLabel("Iterations:")
+        morph_iter_label.setStyleSheet("color: #343a40; font-weight: bold;")
+        self.spin_morph_iterations = QSpinBox()
+        self.spin_morph_iterations.setRange(1, 20)
+        self.spin_morph_iterations.setValue(1)
+        self.spin_morph_iterations.setStyleSheet(self.spin_thresh.styleSheet())
+        morph_thresh_label = QLabel("Threshold:")
+        morph_thresh_label.setStyleSheet("color: #343a40; font-weight: bold;")
+        self.spin_morph_thresh = QSpinBox()
+        self.spin_morph_thresh.setRange(0, 255)
+        self.spin_morph_thresh.setValue(127)
+        self.spin_morph_thresh.setStyleSheet(self.spin_thresh.styleSheet())
+        morph_iter_layout.addWidget(morph_iter_label)
+        morph_iter_layout.addWidget(self.spin_morph_iterations)
+        morph_iter_layout.addWidget(morph_thresh_label)
+        morph_iter_layout.addWidget(self.spin_morph_thresh)
+        morph_layout.addWidget(morph_iter_widget)
+        self.param_layout.addWidget(self.morph_widget)
+        
         # Brightness/Contrast Parameters
         self.brightness_widget = QWidget()
         brightness_layout = QHBoxLayout(self.brightness_widget)
@@ -484,10 +826,40 @@ class MainWindow(QMainWindow):
         sharpen_layout.addWidget(self.sharpen_value)
         self.param_layout.addWidget(self.sharpen_widget)
         
+        # Precision: hanya terlihat untuk Edge Detection Sobel dan Laplacian (lihat update_edge_parameters)
+        self.precision_widget = QWidget()
+        precision_layout = QHBoxLayout(self.precision_widget)
+        precision_label = QLabel("Precision:")
+        precision_label.setStyleSheet("color: #343a40; font-weight: bold;")
+        self.precision_combo = QComboBox()
+        self.precision_combo.addItems(PRECISIONS)
+        self.precision_combo.setToolTip("Sobel/Laplacian only. float64 = reference; "
+                                        "float32/int16 = faster, max 1 level difference")
+        self.precision_combo.setStyleSheet(self.blur_type_combo.styleSheet())
+        precision_layout.addWidget(precision_label)
+        precision_layout.addWidget(self.precision_combo)
+        self.param_layout.addWidget(self.precision_widget)
+        
         # --- (Akhir dari widget parameter) ---
 
         method_layout.addWidget(self.param_container)
         
+        # Pipeline: tahap sebelumnya + metode yang sedang dipilih sebagai tahap terakhir
+        self.stage_list = QListWidget()
+        self.stage_list.setMaximumHeight(100)
+        self.stage_list.setStyleSheet(self.method_list.styleSheet())
+        method_layout.addWidget(self.stage_list)
+        stage_btn_layout = QHBoxLayout()
+        self.btn_add_stage = QPushButton("➕ Add Stage")
+        self.btn_clear_stages = QPushButton("🗑️ Clear Stages")
+        self.btn_add_stage.setStyleSheet(btn_style)
+        self.btn_clear_stages.setStyleSheet(btn_style)
+        self.btn_add_stage.clicked.connect(self.add_stage)
+        self.btn_clear_stages.clicked.connect(self.clear_stages)
+        stage_btn_layout.addWidget(self.btn_add_stage)
+        stage_btn_layout.addWidget(self.btn_clear_stages)
+        method_layout.addLayout(stage_btn_layout)
+        
         apply_btn = QPushButton("🚀 Apply Processing")
         apply_btn.setStyleSheet("""
             QPushButton {
@@ -535,7 +907,7 @@ class MainWindow(QMainWindow):
             }
         """)
         
-        self.orig_hist_canvas = HistogramCanvas(self, width=4, height=2)
+        self.orig_hist_canvas = LazyHistogram(self, width=4, height=2)
         self.orig_hist_canvas.setFixedSize(400, 200)
         
         orig_content.addWidget(self.lbl_orig)
@@ -560,7 +932,7 @@ class MainWindow(QMainWindow):
         self.lbl_result.setFixedSize(400, 300)
         self.lbl_result.setStyleSheet(self.lbl_orig.styleSheet())
         
-        self.result_hist_canvas = HistogramCanvas(self, width=4, height=2)
+        self.result_hist_canvas = LazyHistogram(self, width=4, height=2)
         self.result_hist_canvas.setFixedSize(400, 200)
         
         result_content.addWidget(self.lbl_result)
@@ -580,24 +952,125 @@ class MainWindow(QMainWindow):
         self.method_changed()
         self.blur_type_combo.currentTextChanged.connect(self.update_blur_parameters)
         self.edge_type_combo.currentTextChanged.connect(self.update_edge_parameters)
+        self._connect_spec_signals()
         self.update_previews(update_histograms=True)
 
-    def start_camera(self):
+    def _connect_spec_signals(self):
+        self.method_list.itemSelectionChanged.connect(self._update_spec)
+        for combo in (self.blur_type_combo, self.blur_engine_combo, self.edge_type_combo,
+                      self.precision_combo, self.morph_shape_combo):
+            combo.currentTextChanged.connect(self._update_spec)
+        for widget in (self.kernel_slider, self.bilateral_slider, self.sigma_slider,
+                       self.canny_thresh1_slider, self.canny_thresh2_slider, self.sobel_slider,
+                       self.spin_thresh, self.spin_brightness, self.spin_contrast, self.sharpen_slider,
+                       self.morph_size_slider, self.spin_morph_iterations, self.spin_morph_thresh):
+            widget.valueChanged.connect(self._update_spec)
+        self._update_spec()
+
+    def current_spec(self):
+        """Read the parameter widgets into an immutable ProcessSpec"""
+        method = self.method_list.currentItem().text() if self.method_list.currentItem() else ""
+        return ProcessSpec(
+            method=method,
+            blur_type=self.blur_type_combo.currentText(),
+            kernel=int(self.kernel_slider.value()),
+            bilateral_d=int(self.bilateral_slider.value()),
+            sigma=int(self.sigma_slider.value()),
+            edge_type=self.edge_type_combo.currentText(),
+            canny_t1=int(self.canny_thresh1_slider.value()),
+            canny_t2=int(self.canny_thresh2_slider.value()),
+            sobel_k=int(self.sobel_slider.value()),
+            thresh=int(self.spin_thresh.value()),
+            brightness=float(self.spin_brightness.value()),
+            contrast=float(self.spin_contrast.value()),
+            sharpen=int(self.sharpen_slider.value()),
+            precision=self.precision_combo.currentText(),
+            blur_engine=self.blur_engine_combo.currentText(),
+            morph_shape=self.morph_shape_combo.currentText(),
+            morph_size=int(self.morph_size_slider.value()),
+            morph_iterations=int(self.spin_morph_iterations.value()),
+            morph_thresh=int(self.spin_morph_thresh.value()),
+        )
+
+    def pipeline_specs(self):
+        return tuple(self.stages) + (self.spec,)
+
+    def _update_spec(self, *args):
+        self.spec = self.current_spec()
+        self._refresh_stage_list()
+        if self.proc_thread is not None:
+            self.proc_thread.stages = self.pipeline_specs()
+        self.schedule_live_preview()
+
+    def _refresh_stage_list(self):
+        self.stage_list.clear()
+        for i, spec in enumerate(self.pipeline_specs(), 1):
+            self.stage_list.addItem(QListWidgetItem(f"{i}. {spec_label(spec)}"))
+
+    def add_stage(self):
+        """Freeze the current method as a pipeline stage and start a new one"""
+        self.stages.append(self.spec)
+        self._update_spec()
+
+    def clear_stages(self):
+        self.stages = []
+        self._update_spec()
+
+    def open_video(self):
+        if self.is_cam_running:
+            self.stop_camera()
+        path, _ = QFileDialog.getOpenFileName(self, "Open video", "", "Videos (*.mp4 *.avi *.mkv *.mov)")
+        if path:
+            self.start_camera(source=path)
+
+    def capture_config(self):
+        """Read the camera settings widgets into a CaptureConfig"""
+        res = self.resolution_combo.currentText()
+        width, height = (int(v) for v in res.split("x")) if "x" in res else (0, 0)
+        fourcc = self.fourcc_combo.currentText()
+        return CaptureConfig(
+            device=self.spin_device.value(),
+            backend=self.backend_combo.currentText(),
+            width=width,
+            height=height,
+            fps=float(self.spin_fps.value()),
+            fourcc="" if fourcc == "Default" else fourcc,
+            buffer_size=self.spin_buffer.value(),
+            skip_decode=self.chk_skip_decode.isChecked(),
+        )
+
+    def start_camera(self, source=0):
         if self.is_cam_running:
             return
 
         print("Starting camera...")
-        self.cam_thread = CameraThread(self)
-        self.cam_thread.frame_ready.connect(self.update_camera_frame)
+        self.orig_key = None
+        self.result_is_proxy = False
+        is_camera = isinstance(source, (int, CaptureConfig))
+        self.proc_thread = ProcessingThread(self.pipeline_specs(), self, mirror=is_camera,
+                                            profiler=self.profiler)
+        self.proc_thread.result_ready.connect(self.update_camera_frame)
+        self.update_governor()
+        self.update_incremental()
+        self.proc_thread.start()
+        self.cam_thread = CameraThread(self, source, profiler=self.profiler)
+        self.cam_thread.wants_frame = self.proc_thread.ready_for_frame
+        self.cam_thread.opened.connect(
+            lambda granted: self.statusBar().showMessage(f"Camera: {format_settings(granted)}"))
+        # Frame langsung masuk mailbox dari thread kamera, tidak menumpuk di
+        # event queue Qt
+        self.cam_thread.on_frame = self.proc_thread.submit
+        # Akhir file video: bongkar seperti tombol Stop. Sinyal dari thread
+        # yang sudah dihentikan lewat stop_camera diabaikan
+        cam_thread = self.cam_thread
+        self.cam_thread.ended.connect(lambda: self._on_source_ended(cam_thread))
         self.cam_thread.start()
         self.is_cam_running = True
         
-        # --- PERUBAHAN ---: Reset timer histogram saat kamera mulai
-        self.last_hist_update_time = 0
-        
         self.btn_start_cam.setEnabled(False)
         self.btn_stop_cam.setEnabled(True)
         self.btn_load.setEnabled(False)
+        self.btn_open_video.setEnabled(False)
         self.lbl_orig.setText("Starting camera...")
         self.lbl_result.setText("Processing will start...")
         
@@ -608,11 +1081,14 @@ class MainWindow(QMainWindow):
         print("Stopping camera...")
         self.cam_thread.stop()
         self.cam_thread = None
+        self.proc_thread.stop()
+        self.proc_thread = None
         self.is_cam_running = False
         
         self.btn_start_cam.setEnabled(True)
         self.btn_stop_cam.setEnabled(False)
         self.btn_load.setEnabled(True)
+        self.btn_open_video.setEnabled(True)
         
         self.update_previews(update_histograms=True)
         
@@ -620,32 +1096,71 @@ class MainWindow(QMainWindow):
              self.lbl_orig.setText("No image loaded")
              self.lbl_result.setText("Processing result will appear here")
 
+    def _on_source_ended(self, cam_thread):
+        if cam_thread is not self.cam_thread:
+            return
+        self.stop_camera()
+        self.statusBar().showMessage("Source ended")
+
     # --- INI ADALAH FUNGSI YANG PALING BANYAK BERUBAH ---
-    def update_camera_frame(self, frame):
+    def update_camera_frame(self):
         """
-        Slot ini dipanggil setiap kali CameraThread mengirimkan frame baru.
+        Slot ini dipanggil setiap kali ProcessingThread selesai memproses frame.
+        Hanya hasil terbaru yang ditampilkan; hasil yang lebih lama sudah dibuang.
         """
-        if not self.is_cam_running or self.is_processing:
+        if not self.is_cam_running or self.proc_thread is None:
+            return
+        item = self.proc_thread.outbox.take()
+        if item is not None:
+            self.orig, self.result, t_capture = item
+            # Histogram cukup murah (calcHist + blit) untuk diperbarui setiap frame
+            self.update_previews(update_histograms=True)
+            self.profiler.record_latency(time.perf_counter() - t_capture)
+        elif self.proc_thread.incremental is None:
             return
+        
+        message = f"Dropped frames: {self.proc_thread.dropped + self.cam_thread.skipped}"
+        if self.cam_thread.skipped:
+            message += f" ({self.cam_thread.skipped} skipped before decode)"
+        governor = self.proc_thread.governor
+        if governor is not None:
+            message += " | " + governor.describe()
+        incremental = self.proc_thread.incremental
+        if incremental is not None:
+            message += " | " + incremental.describe()
+        if self.profiler.enabled:
+            message += " | " + self.profiler.status_text()
+        self.statusBar().showMessage(message)
 
-        self.is_processing = True
+    def update_governor(self, *args):
+        """(Re)create the quality governor of the running camera from the widgets"""
+        if self.proc_thread is None:
+            return
+        if self.chk_governor.isChecked():
+            self.proc_thread.governor = QualityGovernor(float(self.spin_target_fps.value()))
+        else:
+            self.proc_thread.governor = None
 
-        frame = cv2.flip(frame, 1)
-        self.orig = frame
-        self.apply_method()
-        
-        # --- PERUBAHAN ---: Logika timer untuk histogram
-        current_time = time.time()
-        if (current_time - self.last_hist_update_time) > 5.0:
-            # Waktunya update histogram
-            self.update_previews(update_histograms=True)
-            self.last_hist_update_time = current_time # Reset timer
+    def update_incremental(self, *args):
+        """(Re)create the change detector of the running camera from the widgets"""
+        if self.proc_thread is None:
+            return
+        if self.chk_incremental.isChecked():
+            self.proc_thread.incremental = IncrementalProcessor(self.spin_change_thresh.value())
         else:
-            # Belum waktunya, update gambar saja
-            self.update_previews(update_histograms=False)
-        
-        self.is_processing = False
-        # --- AKHIR PERUBAHAN DI FUNGSI INI ---
+            self.proc_thread.incremental = None
+
+    def toggle_stats(self, enabled):
+        self.profiler.reset()
+        self.profiler.enabled = enabled
+        if not enabled:
+            self.statusBar().clearMessage()
+
+    def export_trace(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Export Chrome trace", "trace.json", "JSON (*.json)")
+        if path:
+            n = self.profiler.export_chrome_trace(path)
+            self.statusBar().showMessage(f"Exported {n} trace events to {path}")
 
     def load_image(self):
         if self.is_cam_running:
@@ -654,13 +1169,17 @@ class MainWindow(QMainWindow):
         path, _ = QFileDialog.getOpenFileName(self, "Open image", "", "Images (*.png *.jpg *.bmp)")
         if not path:
             return
-        img = cv2.imdecode(np.fromfile(path, dtype=np.uint8), cv2.IMREAD_COLOR)
+        img = read_image(path)
         if img is None:
             return
         self.orig = img
+        self.orig_key = content_hash(img)
         self.result = img.copy()
+        self.result_is_proxy = False
+        self.live_generation += 1
         
         self.update_previews(update_histograms=True)
+        self.schedule_live_preview()
 
     def save_result(self):
         if self.result is None:
@@ -668,9 +1187,55 @@ class MainWindow(QMainWindow):
         path, _ = QFileDialog.getSaveFileName(self, "Save result", "", "PNG (*.png);;JPEG (*.jpg)")
         if not path:
             return
-        ext = path.split('.')[-1]
-        _, buf = cv2.imencode(f'.{ext}', self.result)
-        buf.tofile(path)
+        if self.result_is_proxy or self.is_cam_running:
+            # Hasil di layar hanya proxy, atau frame kamera yang mungkin memakai
+            # engine cepat / kualitas governor; render ulang secara exact lalu simpan
+            self.render_full_resolution(save_path=path)
+            return
+        self._write_result(path)
+
+    def _write_result(self, path):
+        try:
+            write_image(path, self.result)
+        except (ValueError, cv2.error) as e:
+            print(f"Error saving {path}: {e}")
+
+    def render_full_resolution(self, save_path=None):
+        """Render the current pipeline on the full-resolution image in the background"""
+        if self.orig is None or self.render_thread is not None:
+            return
+        specs = self.pipeline_specs()
+        key = (self.orig_key, specs, 1.0) if self.orig_key is not None else None
+        cached = self.result_cache.get(key) if key is not None else None
+        if cached is not None:
+            self._on_rendered(cached, key, save_path, None)
+            return
+        
+        dialog = QProgressDialog("Rendering full resolution...", "Cancel", 0, len(specs), self)
+        dialog.setWindowModality(Qt.WindowModal)
+        dialog.setMinimumDuration(0)
+        self.render_thread = RenderThread(self.orig, specs, self)
+        dialog.canceled.connect(self.render_thread.cancel)
+        self.render_thread.progress.connect(lambda done, total: dialog.setValue(done))
+        self.render_thread.rendered.connect(
+            lambda result: self._on_rendered(result, key, save_path, dialog))
+        self.render_thread.start()
+
+    def _on_rendered(self, result, key, save_path, dialog):
+        if dialog is not None:
+            dialog.close()
+        if self.render_thread is not None:
+            self.render_thread.wait()
+            self.render_thread = None
+        if result is None:
+            return  # dibatalkan atau gagal
+        if key is not None:
+            self.result_cache.put(key, result)
+        self.result = result
+        self.result_is_proxy = False
+        self.update_previews(update_histograms=True)
+        if save_path:
+            self._write_result(save_path)
 
     def reset(self):
         if self.orig is None:
@@ -681,19 +1246,19 @@ class MainWindow(QMainWindow):
             
         if not self.is_cam_running:
             self.result = self.orig.copy()
+            self.result_is_proxy = False
             self.update_previews(update_histograms=True)
 
     def update_previews(self, update_histograms=True):
         # Original image preview
         if self.orig is not None:
-            qimg_o = qimg_from_cv(self.orig)
-            pix_o = QPixmap.fromImage(qimg_o).scaled(
-                self.lbl_orig.width(), self.lbl_orig.height(), 
-                Qt.KeepAspectRatio, Qt.SmoothTransformation
-            )
-            self.lbl_orig.setPixmap(pix_o)
+            with self.profiler.stage("preview"):
+                pix_o = pixmap_from_cv(self.orig, self.lbl_orig.width(), self.lbl_orig.height())
+                self.lbl_orig.setPixmap(pix_o)
             if update_histograms:
-                self.orig_hist_canvas.plot_hist(self.orig)
+                with self.profiler.stage("histogram"):
+                    # Gray/histogram yang sudah dihitung pipeline dipakai ulang
+                    self.orig_hist_canvas.plot_hist(self.orig, data=self.pipeline.data_for(self.orig))
         else:
             self.lbl_orig.clear()
             self.lbl_orig.setText("No image loaded")
@@ -702,14 +1267,12 @@ class MainWindow(QMainWindow):
 
         # Result image preview
         if self.result is not None:
-            qimg_r = qimg_from_cv(self.result)
-            pix_r = QPixmap.fromImage(qimg_r).scaled(
-                self.lbl_result.width(), self.lbl_result.height(), 
-                Qt.KeepAspectRatio, Qt.SmoothTransformation
-            )
-            self.lbl_result.setPixmap(pix_r)
+            with self.profiler.stage("preview"):
+                pix_r = pixmap_from_cv(self.result, self.lbl_result.width(), self.lbl_result.height())
+                self.lbl_result.setPixmap(pix_r)
             if update_histograms:
-                self.result_hist_canvas.plot_hist(self.result)
+                with self.profiler.stage("histogram"):
+                    self.result_hist_canvas.plot_hist(self.result, data=self.pipeline.data_for(self.result))
         else:
             self.lbl_result.clear()
             self.lbl_result.setText("Processing result will appear here")
@@ -741,6 +1304,8 @@ class MainWindow(QMainWindow):
         edge_type = self.edge_type_combo.currentText()
         self.canny_widget.setVisible(False)
         self.sobel_widget.setVisible(False)
+        # Precision hanya dipakai Sobel dan Laplacian
+        self.precision_widget.setVisible(edge_type in ("Sobel", "Laplacian"))
         
         if edge_type == "Canny":
             self.canny_widget.setVisible(True)
@@ -765,8 +1330,10 @@ class MainWindow(QMainWindow):
         self.edge_type_widget.setVisible(False)
         self.kernel_widget.setVisible(False)
         self.thresh_widget.setVisible(False)
+        self.morph_widget.setVisible(False)
         self.canny_widget.setVisible(False)
         self.sobel_widget.setVisible(False)
+        self.precision_widget.setVisible(False)
         self.bilateral_widget.setVisible(False)
         self.sigma_widget.setVisible(False)
         self.brightness_widget.setVisible(False)
@@ -783,6 +1350,8 @@ class MainWindow(QMainWindow):
         elif method == "Threshold (Binary)":
             self.thresh_widget.setVisible(True)
             self.spin_thresh.setValue(127)
+        elif method in ("Morphology (Open)", "Morphology (Close)", "Dilation", "Erosion"):
+            self.morph_widget.setVisible(True)
         elif method == "Brightness/Contrast Adjustment":
             self.brightness_widget.setVisible(True)
             self.contrast_widget.setVisible(True)
@@ -800,92 +1369,102 @@ class MainWindow(QMainWindow):
             self.update_previews(update_histograms=True)
 
     def apply_method(self):
+        # Hasil live preview yang masih berjalan jadi usang
+        self.live_generation += 1
         if self.orig is None:
             self.result = None
             return
             
-        method = self.method_list.currentItem().text() if self.method_list.currentItem() else ""
-        img = self.orig.copy()
+        specs = self.pipeline_specs()
+        src, scale = self._preview_source()
+        key = (self.orig_key, specs, scale) if self.orig_key is not None else None
+        if key is not None:
+            cached = self.result_cache.get(key)
+            if cached is not None:
+                self.result = cached
+                self.result_is_proxy = scale != 1.0
+                self._show_cache_stats()
+                return
         
         try:
-            if method == "Image Negative":
-                self.result = cv2.bitwise_not(img)
-            elif method == "Grayscale":
-                self.result = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-            elif method == "Histogram Equalization":
-                gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-                self.result = cv2.equalizeHist(gray)
-            elif method == "Threshold (Binary)":
-                gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-                t = int(self.spin_thresh.value())
-                _, self.result = cv2.threshold(gray, t, 255, cv2.THRESH_BINARY)
-            elif method == "Blurring/Smoothing":
-                blur_type = self.blur_type_combo.currentText()
-                if blur_type == "Gaussian Blur":
-                    k = int(self.kernel_slider.value())
-                    if k % 2 == 0: k += 1
-                    if k < 1: k = 1
-                    self.result = cv2.GaussianBlur(img, (k, k), 0)
-                elif blur_type == "Median Blur":
-                    k = int(self.kernel_slider.value())
-                    if k % 2 == 0: k += 1
-                    if k < 1: k = 1
-                    self.result = cv2.medianBlur(img, k)
-                elif blur_type == "Mean Blur":
-                    k = int(self.kernel_slider.value())
-                    if k < 1: k = 1
-                    self.result = cv2.blur(img, (k, k))
-                elif blur_type == "Bilateral Filter":
-                    d = int(self.bilateral_slider.value())
-                    sigma = int(self.sigma_slider.value())
-                    self.result = cv2.bilateralFilter(img, d, sigma, sigma)
-            elif method == "Edge Detection":
-                edge_type = self.edge_type_combo.currentText()
-                gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-                if edge_type == "Canny":
-                    t1 = int(self.canny_thresh1_slider.value())
-                    t2 = int(self.canny_thresh2_slider.value())
-                    self.result = cv2.Canny(gray, t1, t2)
-                elif edge_type == "Sobel":
-                    k = int(self.sobel_slider.value())
-                    if k % 2 == 0: k += 1
-                    if k < 1: k = 1
-                    sobelx = cv2.Sobel(gray, cv2.CV_64F, 1, 0, ksize=k)
-                    sobely = cv2.Sobel(gray, cv2.CV_64F, 0, 1, ksize=k)
-                    sobel = np.sqrt(sobelx**2 + sobely**2)
-                    self.result = np.uint8(255 * sobel / np.max(sobel)) if np.max(sobel) > 0 else np.zeros_like(sobelx, dtype=np.uint8)
-                elif edge_type == "Laplacian":
-                    laplacian = cv2.Laplacian(gray, cv2.CV_64F)
-                    self.result = np.uint8(np.absolute(laplacian))
-            elif method in ["Morphology (Open)", "Morphology (Close)", "Dilation", "Erosion"]:
-                kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))
-                gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-                _, th = cv2.threshold(gray, 127, 255, cv2.THRESH_BINARY)
-                if method == "Morphology (Open)":
-                    self.result = cv2.morphologyEx(th, cv2.MORPH_OPEN, kernel)
-                elif method == "Morphology (Close)":
-                    self.result = cv2.morphologyEx(th, cv2.MORPH_CLOSE, kernel)
-                elif method == "Dilation":
-                    self.result = cv2.dilate(th, kernel, iterations=1)
-                elif method == "Erosion":
-                    self.result = cv2.erode(th, kernel, iterations=1)
-            elif method == "Brightness/Contrast Adjustment":
-                brightness = float(self.spin_brightness.value())
-                contrast = float(self.spin_contrast.value())
-                self.result = cv2.convertScaleAbs(img, alpha=contrast, beta=brightness)
-            elif method == "Sharpen / Contrast":
-                kernel = np.array([[0,-1,0], [-1,5,-1], [0,-1,0]])
-                sharp = cv2.filter2D(img, -1, kernel)
-                self.result = cv2.convertScaleAbs(sharp, alpha=1, beta=0)
-            else:
-                self.result = img
+            self.pipeline.set_stages(tuple(scale_spec(s, scale) for s in specs))
+            self.result = self.pipeline.run(src)
+            self.result_is_proxy = scale != 1.0
         except Exception as e:
-            print(f"Error applying method {method}: {e}")
-            self.result = img
+            print(f"Error applying pipeline: {e}")
+            self.result = self.orig.copy()
+            self.result_is_proxy = False
+            return
+        if key is not None:
+            self.result_cache.put(key, self.result)
+            self._show_cache_stats()
+
+    def toggle_live_preview(self, enabled):
+        if enabled:
+            self.schedule_live_preview()
+        else:
+            self.live_timer.stop()
+            self.live_generation += 1
+
+    def schedule_live_preview(self):
+        """Coalesce parameter changes: at most one submission per LIVE_DEBOUNCE_MS"""
+        if self.chk_live.isChecked() and not self.live_timer.isActive():
+            self.live_timer.start()
+
+    def _run_live_preview(self):
+        # Kamera sudah memakai spec terbaru di setiap frame
+        if self.orig is None or self.is_cam_running:
+            return
+        specs = self.pipeline_specs()
+        src, scale = self._preview_source()
+        key = (self.orig_key, specs, scale) if self.orig_key is not None else None
+        self.live_generation += 1
+        cached = self.result_cache.get(key) if key is not None else None
+        if cached is not None:
+            self._show_live_result(cached, scale)
+            return
+        if self.preview_thread is None:
+            self.preview_thread = PreviewThread(self)
+            self.preview_thread.computed.connect(self._on_live_computed)
+            self.preview_thread.start()
+        self._live_job = (self.live_generation, key, scale)
+        self.preview_thread.submit(self.live_generation, src, tuple(scale_spec(s, scale) for s in specs))
+
+    def _on_live_computed(self, generation, result):
+        if self._live_job is None or generation != self.live_generation:
+            return  # parameter atau gambar sudah berubah
+        _, key, scale = self._live_job
+        self._live_job = None
+        if key is not None:
+            self.result_cache.put(key, result)
+        self._show_live_result(result, scale)
+
+    def _show_live_result(self, result, scale):
+        self.result = result
+        self.result_is_proxy = scale != 1.0
+        self.update_previews(update_histograms=True)
+
+    def _preview_source(self):
+        """Image to run interactive edits on: a cached proxy for large still images"""
+        if self.is_cam_running or not self.chk_proxy.isChecked():
+            return self.orig, 1.0
+        if self._proxy_src is not self.orig:
+            self.proxy, self.proxy_scale = make_proxy(self.orig)
+            self._proxy_src = self.orig
+        return self.proxy, self.proxy_scale
+
+    def _show_cache_stats(self):
+        c = self.result_cache
+        self.statusBar().showMessage(
+            f"Cache: {c.hits} hits / {c.misses} misses, {len(c)} entries, {c.nbytes / 2**20:.0f} MB")
 
     def closeEvent(self, event):
         print("Closing window...")
         self.stop_camera()
+        self.live_timer.stop()
+        if self.preview_thread is not None:
+            self.preview_thread.stop()
+            self.preview_thread = None
         event.accept()
 
 if __name__ == "__main__":
@@ -0,0 +1,219 @@
+"""
+Batch mode: proses satu folder (atau glob) gambar tanpa GUI.
+
+Contoh:
+    python batch.py "scans/*.jpg" -o hasil --method "Blurring/Smoothing" --blur-type "Median Blur" --kernel 5 -j 8
+
+Setiap file yang selesai dicatat di manifest (JSON lines) di folder output,
+sehingga job yang crash bisa dilanjutkan cukup dengan menjalankan ulang
+perintah yang sama. Setiap entri menyimpan hash parameter; file yang dulu
+diproses dengan parameter lain diproses ulang.
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import asdict
+
+import cv2
+
+from engine import (
+    BLUR_ENGINES, BLUR_TYPES, EDGE_TYPES, METHODS, MORPH_SHAPES, PRECISIONS, ProcessSpec, process,
+    read_image, spec_from_dict, write_image,
+)
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff", ".webp")
+MANIFEST_NAME = "manifest.jsonl"
+
+
+def add_spec_arguments(parser):
+    """Add one --option per ProcessSpec field, defaulting to the GUI defaults."""
+    d = ProcessSpec()
+    parser.add_argument("--method", choices=METHODS, required=True)
+    parser.add_argument("--blur-type", choices=BLUR_TYPES, default=d.blur_type)
+    parser.add_argument("--kernel", type=int, default=d.kernel)
+    parser.add_argument("--bilateral-d", type=int, default=d.bilateral_d)
+    parser.add_argument("--sigma", type=int, default=d.sigma)
+    parser.add_argument("--edge-type", choices=EDGE_TYPES, default=d.edge_type)
+    parser.add_argument("--canny-t1", type=int, default=d.canny_t1)
+    parser.add_argument("--canny-t2", type=int, default=d.canny_t2)
+    parser.add_argument("--sobel-k", type=int, default=d.sobel_k)
+    parser.add_argument("--thresh", type=int, default=d.thresh)
+    parser.add_argument("--brightness", type=float, default=d.brightness)
+    parser.add_argument("--contrast", type=float, default=d.contrast)
+    parser.add_argument("--sharpen", type=int, default=d.sharpen)
+    parser.add_argument("--precision", choices=PRECISIONS, default=d.precision,
+                        help="Sobel/Laplacian only: float32/int16 trade a little accuracy for speed "
+                             "(see bench.py --accuracy)")
+    parser.add_argument("--blur-engine", choices=BLUR_ENGINES, default=d.blur_engine,
+                        help="median/bilateral engine; fast is an approximation, auto uses it "
+                             "for large kernels on live camera streams only")
+    parser.add_argument("--morph-shape", choices=MORPH_SHAPES, default=d.morph_shape,
+                        help="structuring element of Dilation/Erosion/Morphology")
+    parser.add_argument("--morph-size", type=int, default=d.morph_size)
+    parser.add_argument("--morph-iterations", type=int, default=d.morph_iterations)
+    parser.add_argument("--morph-thresh", type=int, default=d.morph_thresh,
+                        help="binarization threshold applied before the morphology")
+
+
+def spec_from_args(args):
+    return spec_from_dict(vars(args))
+
+
+def find_inputs(pattern, recursive=False):
+    """Return (root, sorted image paths) for a directory or a glob pattern."""
+    if os.path.isdir(pattern):
+        root = pattern
+        sub = "**" if recursive else ""
+        paths = glob.glob(os.path.join(glob.escape(pattern), sub, "*"), recursive=recursive)
+    else:
+        paths = glob.glob(pattern, recursive=True)
+        root = os.path.commonpath([os.path.dirname(os.path.abspath(p)) for p in paths]) if paths else "."
+    paths = sorted(p for p in paths if os.path.isfile(p) and p.lower().endswith(IMAGE_EXTENSIONS))
+    return root, paths
+
+
+def output_path(src, root, out_dir, ext=None):
+    rel = os.path.relpath(os.path.abspath(src), os.path.abspath(root))
+    if ext:
+        ext = ext if ext.startswith(".") else "." + ext
+        rel = os.path.splitext(rel)[0] + ext
+    return os.path.join(out_dir, rel)
+
+
+def spec_key(spec):
+    """Stable hash of every parameter of ``spec``, stored with each manifest entry."""
+    text = json.dumps(asdict(spec), sort_keys=True)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+def load_manifest(path, key):
+    """Return ``(done, stale)``: source paths already processed successfully
+    with the spec hash ``key`` (mapped to their output path), and the set of
+    sources whose last successful run used other parameters."""
+    done = {}
+    stale = set()
+    if not os.path.exists(path):
+        return done, stale
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue  # baris terakhir bisa terpotong kalau proses crash
+            if entry.get("status") != "ok" or not os.path.exists(entry.get("dst", "")):
+                continue
+            if entry.get("spec") == key:
+                done[entry["src"]] = entry["dst"]
+                stale.discard(entry["src"])
+            else:
+                # Entri lama tanpa hash juga dianggap beda parameter
+                done.pop(entry["src"], None)
+                stale.add(entry["src"])
+    return done, stale
+
+
+def _init_worker():
+    # Paralelisme sudah dari pool proses, jangan ditambah thread OpenCV
+    cv2.setNumThreads(1)
+
+
+def process_file(src, dst, spec):
+    """Worker: decode, process and encode one file. Returns (src, dst, error)."""
+    try:
+        img = read_image(src)
+        if img is None:
+            return src, dst, "cannot decode image"
+        result = process(img, spec)
+        os.makedirs(os.path.dirname(dst) or ".", exist_ok=True)
+        write_image(dst, result)
+        return src, dst, None
+    except Exception as e:
+        return src, dst, str(e)
+
+
+def _print_progress(done, total, failed, start):
+    elapsed = time.perf_counter() - start
+    rate = done / elapsed if elapsed > 0 else 0.0
+    eta = (total - done) / rate if rate > 0 else 0.0
+    sys.stderr.write(f"\r[{done}/{total}] {rate:.1f} img/s, {failed} failed, ETA {eta:.0f}s ")
+    sys.stderr.flush()
+
+
+def run_batch(jobs, spec, manifest_path, workers=None, max_inflight=None):
+    """Process ``jobs`` [(src, dst), ...] on a process pool, appending to the manifest.
+
+    At most ``max_inflight`` files are submitted at a time, so memory stays
+    bounded no matter how many files are queued.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_inflight = max_inflight or 2 * workers
+    total = len(jobs)
+    done = failed = 0
+    start = time.perf_counter()
+    jobs = iter(jobs)
+    pending = set()
+    key = spec_key(spec)
+
+    with open(manifest_path, "a", encoding="utf-8") as manifest, \
+            ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        while True:
+            for src, dst in jobs:
+                pending.add(pool.submit(process_file, src, dst, spec))
+                if len(pending) >= max_inflight:
+                    break
+            if not pending:
+                break
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                src, dst, error = fut.result()
+                entry = {"src": src, "dst": dst, "spec": key, "status": "error" if error else "ok"}
+                if error:
+                    entry["error"] = error
+                    failed += 1
+                manifest.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                done += 1
+            manifest.flush()
+            _print_progress(done, total, failed, start)
+    if total:
+        sys.stderr.write("\n")
+    return done, failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch image processing with the METHODS catalog")
+    parser.add_argument("input", help="input directory or glob pattern")
+    parser.add_argument("-o", "--output", required=True, help="output directory")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--max-inflight", type=int, default=None,
+                        help="max files decoded/processed at once (default 2 x workers)")
+    parser.add_argument("--ext", default=None, help="output extension, e.g. .png or png (default: keep)")
+    parser.add_argument("--recursive", action="store_true", help="walk subdirectories of an input directory")
+    parser.add_argument("--no-resume", action="store_true", help="ignore an existing manifest")
+    add_spec_arguments(parser)
+    args = parser.parse_args(argv)
+
+    spec = spec_from_args(args)
+    root, paths = find_inputs(args.input, args.recursive)
+    os.makedirs(args.output, exist_ok=True)
+    manifest_path = os.path.join(args.output, MANIFEST_NAME)
+    if args.no_resume and os.path.exists(manifest_path):
+        os.remove(manifest_path)
+    done, stale = load_manifest(manifest_path, spec_key(spec))
+    redo = sum(1 for p in paths if p in stale)
+    if redo:
+        print(f"{redo} images were processed with different parameters and will be redone")
+
+    jobs = [(p, dst) for p, dst in ((p, output_path(p, root, args.output, args.ext)) for p in paths)
+            if done.get(p) != dst]
+    print(f"{len(paths)} images found, {len(paths) - len(jobs)} already done, {len(jobs)} to process")
+    _, failed = run_batch(jobs, spec, manifest_path, args.workers, args.max_inflight)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,479 @@
+"""
+Benchmark semua metode di METHODS (dan sub-variannya) pada beberapa resolusi.
+
+Hasil ditulis sebagai JSON dan bisa dibandingkan dengan baseline yang
+tersimpan untuk mendeteksi regresi. Kolom memori (peak_mem_mb) hanya heap
+Python/NumPy (tracemalloc), batas bawah dari memori sebenarnya.
+
+Contoh:
+    python bench.py -o bench.json
+    python bench.py --resolutions VGA 1080p --baseline bench.json
+    python bench.py --images foto/ --methods Sobel Median
+    python bench.py --precision float32 --methods Sobel
+    python bench.py --accuracy --resolutions VGA 1080p
+    python bench.py --morphology --resolutions 1080p
+    python bench.py --startup -o startup.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import replace
+
+import cv2
+import numpy as np
+
+from batch import find_inputs
+from engine import (
+    BLUR_ENGINES, BLUR_TYPES, EDGE_TYPES, METHODS, MORPH_SHAPES, PRECISIONS, ProcessSpec,
+    blur_engine_for, morph_params, process, read_image, structuring_element, to_gray, uses_precision,
+)
+
+RESOLUTIONS = {
+    "VGA": (480, 640),
+    "1080p": (1080, 1920),
+    "4K": (2160, 3840),
+    "24MP": (4000, 6000),
+}
+
+
+def benchmark_cases():
+    """(name, spec) for every METHODS entry, expanding blur and edge sub-types."""
+    cases = []
+    for method in METHODS:
+        if method == "Blurring/Smoothing":
+            cases += [(f"{method}/{b}", ProcessSpec(method=method, blur_type=b)) for b in BLUR_TYPES]
+        elif method == "Edge Detection":
+            cases += [(f"{method}/{e}", ProcessSpec(method=method, edge_type=e)) for e in EDGE_TYPES]
+        else:
+            cases.append((method, ProcessSpec(method=method)))
+    return cases
+
+
+# Varian yang dibandingkan dengan referensi (float64, engine exact) beserta
+# batas deviasinya; nilai piksel 0..255
+ACCURACY_VARIANTS = {
+    "float32": ({"precision": "float32"}, {"max_abs": 1, "mean_abs": 0.01}),
+    "int16": ({"precision": "int16"}, {"max_abs": 1, "mean_abs": 0.01}),
+    "fast": ({"blur_engine": "fast"}, {"min_psnr": 25.0}),
+}
+
+
+def accuracy_cases():
+    """benchmark_cases plus every Sobel kernel size and large median/bilateral kernels."""
+    cases = benchmark_cases()
+    for k in (1, 5, 7):
+        cases.append((f"Edge Detection/Sobel k={k}",
+                      ProcessSpec(method="Edge Detection", edge_type="Sobel", sobel_k=k)))
+    for k in (9, 15, 31):
+        cases.append((f"Blurring/Smoothing/Median Blur k={k}",
+                      ProcessSpec(method="Blurring/Smoothing", blur_type="Median Blur", kernel=k)))
+    for d in (15, 25, 50):
+        cases.append((f"Blurring/Smoothing/Bilateral Filter d={d}",
+                      ProcessSpec(method="Blurring/Smoothing", blur_type="Bilateral Filter", bilateral_d=d)))
+    return cases
+
+
+def _applies(spec, changes):
+    # precision hanya dipakai Sobel/Laplacian; engine cepat hanya ada untuk Median/Bilateral
+    if spec.method != "Blurring/Smoothing":
+        return "blur_engine" not in changes and uses_precision(spec)
+    return "blur_engine" in changes and blur_engine_for(replace(spec, **changes)) == "fast"
+
+
+def _timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return out, (time.perf_counter() - t0) * 1000
+
+
+def accuracy_report(cases, images, variants=ACCURACY_VARIANTS):
+    """Compare each variant against the exact float64 reference output.
+
+    Every entry carries max/mean absolute error, PSNR, the share of differing
+    pixels, the speed-up of that single run and whether it is within the
+    variant's tolerance.
+    """
+    report = []
+    for (image_name, res), img in images.items():
+        for case_name, spec in cases:
+            spec = replace(spec, precision=PRECISIONS[0], blur_engine="exact")
+            variants_here = {n: v for n, v in variants.items() if _applies(spec, v[0])}
+            if not variants_here:
+                continue
+            process(img, spec)  # warm-up
+            ref, ref_ms = _timed(lambda: process(img, spec))
+            ref = ref.astype(np.int16)
+            for name, (changes, tolerance) in variants_here.items():
+                variant = replace(spec, **changes)
+                out, ms = _timed(lambda: process(img, variant))
+                diff = np.abs(out - ref)
+                mse = float(np.mean(np.square(diff, dtype=np.float64)))
+                entry = {
+                    "case": case_name,
+                    "variant": name,
+                    "resolution": res,
+                    "image": image_name,
+                    "max_abs": int(diff.max()),
+                    "mean_abs": float(diff.mean()),
+                    "psnr_db": 10 * np.log10(255.0**2 / mse) if mse > 0 else float("inf"),
+                    "mismatch_pct": 100.0 * np.count_nonzero(diff) / diff.size,
+                    "speedup": ref_ms / ms if ms > 0 else 0.0,
+                }
+                entry["ok"] = (entry["max_abs"] <= tolerance.get("max_abs", 255)
+                               and entry["mean_abs"] <= tolerance.get("mean_abs", 255.0)
+                               and entry["psnr_db"] >= tolerance.get("min_psnr", 0.0))
+                report.append(entry)
+    return report
+
+
+_MORPH_REFERENCE_OPS = {
+    "Dilation": cv2.MORPH_DILATE,
+    "Erosion": cv2.MORPH_ERODE,
+    "Morphology (Open)": cv2.MORPH_OPEN,
+    "Morphology (Close)": cv2.MORPH_CLOSE,
+}
+
+
+def morphology_cases(sizes=(7, 25, 51, 75)):
+    """Dilation and opening with every structuring element at small to large sizes."""
+    return [(f"{method}/{shape} {size}", ProcessSpec(method=method, morph_shape=shape, morph_size=size))
+            for method in ("Dilation", "Morphology (Open)") for shape in MORPH_SHAPES for size in sizes]
+
+
+def morphology_report(cases, images, repeat=3):
+    """Time the engine's morphology against plain cv2.morphologyEx with the exact element.
+
+    Both sides include the binarization; ``mismatch_pct`` is only non-zero
+    where the engine approximates (large ellipses).
+    """
+    report = []
+    for (image_name, res), img in images.items():
+        gray = to_gray(img)
+        for case_name, spec in cases:
+            size, iterations = morph_params(spec)
+            element = structuring_element(spec.morph_shape, size)
+
+            def reference():
+                _, th = cv2.threshold(gray, int(spec.morph_thresh), 255, cv2.THRESH_BINARY)
+                return cv2.morphologyEx(th, _MORPH_REFERENCE_OPS[spec.method], element, iterations=iterations)
+
+            ref = reference()
+            out = process(img, spec, gray)
+            ref_ms = min(_timed(reference)[1] for _ in range(repeat))
+            ms = min(_timed(lambda: process(img, spec, gray))[1] for _ in range(repeat))
+            report.append({
+                "case": case_name,
+                "resolution": res,
+                "image": image_name,
+                "reference_ms": ref_ms,
+                "engine_ms": ms,
+                "speedup": ref_ms / ms if ms > 0 else 0.0,
+                "mismatch_pct": 100.0 * np.count_nonzero(out != ref) / ref.size,
+            })
+    return report
+
+
+# Setiap probe dijalankan di interpreter baru supaya cache import kosong;
+# waktu diukur dari awal snippet, tanpa start-up interpreter itu sendiri
+_FIRST_FRAME = """
+from PySide6.QtWidgets import QApplication
+import app
+from bench import synthetic_image
+qt = QApplication([])
+window = app.MainWindow()
+window.show()
+qt.processEvents()
+mark("window")
+img = synthetic_image(480, 640)
+window.orig, window.result = img, img.copy()
+window.update_previews(update_histograms=True)
+window.method_list.setCurrentRow(app.METHODS.index("Edge Detection"))
+window.apply_and_update()
+qt.processEvents()
+mark("first frame")
+"""
+
+STARTUP_PROBES = {
+    "import engine": "import engine",
+    "import pipeline": "import pipeline",
+    "import server": "import server",
+    "import app": "import app",
+    "gui": _FIRST_FRAME,
+}
+
+_PROBE_TEMPLATE = """
+import json, time
+_t0 = time.perf_counter()
+_marks = {{}}
+def mark(name):
+    _marks[name] = (time.perf_counter() - _t0) * 1000
+{code}
+if not _marks:
+    mark("total")
+print(json.dumps(_marks))
+"""
+
+
+def _run_probe(code):
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    out = subprocess.run([sys.executable, "-c", _PROBE_TEMPLATE.format(code=code)], env=env,
+                         cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True,
+                         text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def startup_report(probes=STARTUP_PROBES, repeat=5):
+    """Import and time-to-first-frame times (ms) measured in fresh interpreters.
+
+    One entry per probe and mark; ``min_ms`` is the least noisy figure for
+    comparisons, ``p50_ms`` what a user typically sees.
+    """
+    report = []
+    for name, code in probes.items():
+        runs = [_run_probe(code) for _ in range(repeat)]
+        for mark in runs[0]:
+            times = np.array([run[mark] for run in runs])
+            label = name if mark == "total" else f"{name}: {mark}"
+            report.append({"probe": label, "min_ms": float(times.min()),
+                           "p50_ms": float(np.percentile(times, 50))})
+    return report
+
+
+def synthetic_image(height, width, seed=0):
+    """Deterministic test image: gradients, shapes, text and a little noise."""
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:height, 0:width]
+    img = np.dstack([(x * 255 // max(width - 1, 1)), (y * 255 // max(height - 1, 1)),
+                     ((x + y) * 255 // max(width + height - 2, 1))]).astype(np.uint8)
+    s = min(height, width)
+    for i in range(12):
+        center = (int(rng.integers(0, width)), int(rng.integers(0, height)))
+        color = tuple(int(c) for c in rng.integers(0, 256, 3))
+        cv2.circle(img, center, int(s * rng.uniform(0.02, 0.12)), color, -1)
+        cv2.rectangle(img, center, (center[0] + s // 10, center[1] + s // 14), color[::-1], max(1, s // 200))
+    cv2.putText(img, "Benchmark", (width // 10, height // 2), cv2.FONT_HERSHEY_SIMPLEX,
+                s / 200, (255, 255, 255), max(1, s // 150))
+    noise = rng.normal(0, 6, img.shape)
+    return np.clip(img + noise, 0, 255).astype(np.uint8)
+
+
+def load_images(directory, resolutions):
+    """Real images from ``directory``, resized to each benchmark resolution."""
+    images = {}
+    for path in find_inputs(directory)[1]:
+        name = os.path.basename(path)
+        img = read_image(path)
+        if img is None:
+            continue
+        for res, (h, w) in resolutions.items():
+            images[(name, res)] = cv2.resize(img, (w, h), interpolation=cv2.INTER_AREA)
+    return images
+
+
+PEAK_MEM_NOTE = ("py-heap / peak_mem_mb: Python/NumPy heap peak from tracemalloc, a lower bound; "
+                 "OpenCV's internal C++ buffers are not counted")
+
+
+def time_case(fn, repeat, min_time):
+    """Run ``fn`` once to warm up, then at least ``repeat`` times or ``min_time`` seconds.
+
+    Peak memory comes from one extra traced run, so tracemalloc's overhead
+    does not leak into the timings. It is a lower bound: tracemalloc sees
+    Python/NumPy allocations (e.g. the output array) but not OpenCV's
+    internal C++ buffers, so methods with large temporaries use more.
+    """
+    fn()
+    times = []
+    start = time.perf_counter()
+    while len(times) < repeat or (time.perf_counter() - start) < min_time:
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return np.array(times), peak
+
+
+def run_benchmarks(cases, images, repeat=5, min_time=0.0, progress=None):
+    results = []
+    for (image_name, res), img in images.items():
+        mpix = img.shape[0] * img.shape[1] / 1e6
+        for case_name, spec in cases:
+            times, peak = time_case(lambda: process(img, spec), repeat, min_time)
+            p50 = float(np.percentile(times, 50))
+            entry = {
+                "case": case_name,
+                "resolution": res,
+                "image": image_name,
+                "runs": len(times),
+                "p50_ms": p50 * 1000,
+                "p99_ms": float(np.percentile(times, 99)) * 1000,
+                "mean_ms": float(times.mean()) * 1000,
+                "mpix_per_s": mpix / p50 if p50 > 0 else 0.0,
+                "fps": 1.0 / p50 if p50 > 0 else 0.0,
+                "peak_mem_mb": peak / 2**20,
+            }
+            results.append(entry)
+            if progress is not None:
+                progress(entry)
+    return results
+
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "opencv": cv2.__version__,
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "opencv_threads": cv2.getNumThreads(),
+    }
+
+
+def _key(entry):
+    return entry["case"], entry["resolution"], entry["image"]
+
+
+def compare(results, baseline, tolerance):
+    """Return entries whose p50 got slower than the baseline by more than ``tolerance``."""
+    base = {_key(e): e for e in baseline["results"]}
+    regressions = []
+    for entry in results:
+        old = base.get(_key(entry))
+        if old is None or old["p50_ms"] <= 0:
+            continue
+        ratio = entry["p50_ms"] / old["p50_ms"]
+        if ratio > 1.0 + tolerance:
+            regressions.append((entry, old, ratio))
+    return regressions
+
+
+def _print_entry(e):
+    print(f"{e['case']:<42} {e['resolution']:>6} {e['image'][:16]:<16} p50 {e['p50_ms']:9.2f} ms  "
+          f"p99 {e['p99_ms']:9.2f} ms  {e['mpix_per_s']:8.1f} MP/s  py-heap {e['peak_mem_mb']:7.1f} MB")
+
+
+def _print_accuracy(e):
+    print(f"{e['case']:<42} {e['variant']:>7} {e['resolution']:>6} {e['image'][:16]:<16} "
+          f"max {e['max_abs']:3d}  mean {e['mean_abs']:.5f}  PSNR {e['psnr_db']:6.2f} dB  "
+          f"differs {e['mismatch_pct']:7.3f}%  {e['speedup']:6.1f}x{'' if e['ok'] else '  FAIL'}")
+
+
+def _print_morphology(e):
+    print(f"{e['case']:<42} {e['resolution']:>6} {e['image'][:16]:<16} "
+          f"morphologyEx {e['reference_ms']:9.2f} ms  engine {e['engine_ms']:9.2f} ms  "
+          f"{e['speedup']:6.1f}x  differs {e['mismatch_pct']:7.3f}%")
+
+
+def _print_startup(e):
+    print(f"{e['probe']:<42} min {e['min_ms']:9.1f} ms  p50 {e['p50_ms']:9.1f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark every METHODS entry across resolutions")
+    parser.add_argument("-o", "--output", help="write results as JSON")
+    parser.add_argument("--baseline", help="compare against a previous JSON result")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed p50 slowdown (0.15 = 15%%)")
+    parser.add_argument("--resolutions", nargs="+", choices=list(RESOLUTIONS), default=list(RESOLUTIONS))
+    parser.add_argument("--methods", nargs="+", default=None, help="only cases containing one of these substrings")
+    parser.add_argument("--images", help="directory of real images (in addition to the synthetic one)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.0, help="minimum seconds per case")
+    parser.add_argument("--threads", type=int, default=None, help="cv2.setNumThreads")
+    parser.add_argument("--precision", choices=PRECISIONS, default=PRECISIONS[0],
+                        help="precision used for the timed cases")
+    parser.add_argument("--blur-engine", choices=BLUR_ENGINES, default=BLUR_ENGINES[0],
+                        help="median/bilateral engine used for the timed cases")
+    parser.add_argument("--accuracy", action="store_true",
+                        help="check reduced precisions and fast blur engines against the reference")
+    parser.add_argument("--morphology", action="store_true",
+                        help="compare morphology structuring elements against cv2.morphologyEx")
+    parser.add_argument("--startup", action="store_true",
+                        help="measure import times and GUI time-to-first-frame in fresh interpreters")
+    args = parser.parse_args(argv)
+
+    if args.threads is not None:
+        cv2.setNumThreads(args.threads)
+    if args.startup:
+        report = startup_report(repeat=args.repeat)
+        for entry in report:
+            _print_startup(entry)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump({"environment": environment(), "results": report}, f, indent=2)
+        if args.baseline:
+            with open(args.baseline, encoding="utf-8") as f:
+                old = {e["probe"]: e for e in json.load(f)["results"]}
+            slower = [e for e in report if e["probe"] in old
+                      and e["min_ms"] > old[e["probe"]]["min_ms"] * (1.0 + args.tolerance)]
+            for e in slower:
+                print(f"REGRESSION {e['probe']}: {old[e['probe']]['min_ms']:.1f} -> {e['min_ms']:.1f} ms")
+            return 1 if slower else 0
+        return 0
+
+    if args.morphology:
+        cases = morphology_cases()
+    else:
+        cases = accuracy_cases() if args.accuracy else benchmark_cases()
+    if args.methods:
+        cases = [c for c in cases if any(m.lower() in c[0].lower() for m in args.methods)]
+    resolutions = {r: RESOLUTIONS[r] for r in args.resolutions}
+    images = {("synthetic", r): synthetic_image(*hw) for r, hw in resolutions.items()}
+    if args.images:
+        images.update(load_images(args.images, resolutions))
+
+    if args.morphology:
+        report = morphology_report(cases, images, args.repeat)
+        for entry in report:
+            _print_morphology(entry)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump({"environment": environment(), "results": report}, f, indent=2)
+        return 0
+
+    if args.accuracy:
+        report = accuracy_report(cases, images)
+        for entry in report:
+            _print_accuracy(entry)
+        if args.output:
+            tolerances = {name: tol for name, (_, tol) in ACCURACY_VARIANTS.items()}
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump({"tolerance": tolerances, "results": report}, f, indent=2)
+        failed = [e for e in report if not e["ok"]]
+        print(f"{len(report) - len(failed)}/{len(report)} within tolerance")
+        return 1 if failed else 0
+
+    for field, value, default in (("precision", args.precision, PRECISIONS[0]),
+                                  ("blur_engine", args.blur_engine, BLUR_ENGINES[0])):
+        if value != default:
+            cases = [(f"{name} [{value}]", replace(spec, **{field: value})) for name, spec in cases]
+    print(PEAK_MEM_NOTE)
+    results = run_benchmarks(cases, images, args.repeat, args.min_time, _print_entry)
+    report = {"environment": environment(), "peak_mem_note": PEAK_MEM_NOTE, "results": results}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        for entry, old, ratio in regressions:
+            print(f"REGRESSION {entry['case']} @ {entry['resolution']} ({entry['image']}): "
+                  f"{old['p50_ms']:.2f} -> {entry['p50_ms']:.2f} ms ({ratio:.2f}x)")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.tolerance:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+"""
+Cache hasil pemrosesan dengan batas memori (LRU).
+
+Kunci cache dibuat dari hash isi gambar sumber ditambah daftar ProcessSpec,
+sehingga kembali ke kombinasi metode/parameter yang pernah dihitung cukup
+berupa lookup.
+"""
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+
+
+def content_hash(img):
+    """Fast digest of an image's shape, dtype and pixels (blake2b, 128 bit)."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr((img.shape, img.dtype.str)).encode())
+    h.update(memoryview(np.ascontiguousarray(img)).cast("B"))
+    return h.hexdigest()
+
+
+class ResultCache:
+    """LRU mapping key -> ndarray bounded by the total ``nbytes`` of its values.
+
+    Cached arrays are shared with callers, who must treat them as read-only.
+    """
+
+    def __init__(self, max_bytes=512 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._items = OrderedDict()
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def get(self, key):
+        value = self._items.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._items.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        size = value.nbytes
+        if size > self.max_bytes:
+            return  # tidak muat sama sekali, jangan kosongkan cache untuk ini
+        old = self._items.pop(key, None)
+        if old is not None:
+            self.nbytes -= old.nbytes
+        self._items[key] = value
+        self.nbytes += size
+        while self.nbytes > self.max_bytes:
+            _, evicted = self._items.popitem(last=False)
+            self.nbytes -= evicted.nbytes
+            self.evictions += 1
+
+    def clear(self):
+        self._items.clear()
+        self.nbytes = 0
+
+    def stats(self):
+        return {
+            "entries": len(self._items),
+            "bytes": self.nbytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
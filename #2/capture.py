@@ -0,0 +1,78 @@
+"""
+Konfigurasi kamera: device, backend, resolusi, FPS, FOURCC dan ukuran buffer.
+
+Nilai yang diminta belum tentu dipenuhi driver, jadi ``open_capture``
+selalu mengembalikan nilai yang benar-benar didapat.
+"""
+from dataclasses import dataclass
+
+import cv2
+
+BACKENDS = {
+    "auto": cv2.CAP_ANY,
+    "dshow": cv2.CAP_DSHOW,
+    "msmf": cv2.CAP_MSMF,
+    "v4l2": cv2.CAP_V4L2,
+    "avfoundation": cv2.CAP_AVFOUNDATION,
+    "gstreamer": cv2.CAP_GSTREAMER,
+    "ffmpeg": cv2.CAP_FFMPEG,
+}
+
+
+@dataclass
+class CaptureConfig:
+    """Requested camera settings; 0 / "" means keep the driver default."""
+    device: int = 0
+    backend: str = "auto"
+    width: int = 0
+    height: int = 0
+    fps: float = 0.0
+    fourcc: str = ""
+    buffer_size: int = 0
+    # grab() tanpa decode untuk frame yang toh akan dibuang
+    skip_decode: bool = True
+
+
+def decode_fourcc(value):
+    value = int(value)
+    return "".join(chr((value >> (8 * i)) & 0xFF) for i in range(4)).strip("\x00")
+
+
+def granted_settings(cap):
+    """What the driver actually gave us."""
+    return {
+        "backend": cap.getBackendName() if cap.isOpened() else "",
+        "width": int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+        "height": int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        "fps": cap.get(cv2.CAP_PROP_FPS),
+        "fourcc": decode_fourcc(cap.get(cv2.CAP_PROP_FOURCC)),
+        "buffer_size": int(cap.get(cv2.CAP_PROP_BUFFERSIZE)),
+    }
+
+
+def open_capture(config):
+    """Open and negotiate a camera; returns ``(cap, granted_settings)``.
+
+    FOURCC is set before the frame size because several drivers (UVC on
+    DirectShow/V4L2) only offer 1080p30 once MJPG is selected.
+    """
+    cap = cv2.VideoCapture(config.device, BACKENDS.get(config.backend, cv2.CAP_ANY))
+    if not cap.isOpened():
+        return cap, {}
+    if config.fourcc:
+        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*config.fourcc.ljust(4)[:4]))
+    if config.width and config.height:
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, config.width)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, config.height)
+    if config.fps:
+        cap.set(cv2.CAP_PROP_FPS, config.fps)
+    if config.buffer_size:
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, config.buffer_size)
+    return cap, granted_settings(cap)
+
+
+def format_settings(granted):
+    if not granted:
+        return "camera not opened"
+    return (f"{granted['backend']} {granted['width']}x{granted['height']} @ {granted['fps']:.0f} FPS, "
+            f"{granted['fourcc'] or '?'}, buffer {granted['buffer_size']}")
@@ -0,0 +1,581 @@
+"""
+Engine pemrosesan citra tanpa Qt.
+
+Semua operasi dari daftar METHODS didaftarkan di REGISTRY, dan parameternya
+dibawa oleh ProcessSpec sehingga pipeline yang sama bisa dipakai dari GUI,
+batch job, service maupun benchmark.
+"""
+import os
+from dataclasses import dataclass, fields, replace
+
+import cv2
+import numpy as np
+
+METHODS = [
+    "Image Negative",
+    "Grayscale",
+    "Histogram Equalization",
+    "Threshold (Binary)",
+    "Blurring/Smoothing",
+    "Edge Detection",  # Menggabungkan berbagai jenis edge detection
+    "Morphology (Open)",
+    "Morphology (Close)",
+    "Dilation",
+    "Erosion",
+    "Brightness/Contrast Adjustment",
+    "Sharpen / Contrast"
+]
+
+METHOD_DESCRIPTIONS = {
+    "Image Negative": "Membalik nilai piksel (Invert)",
+    "Grayscale": "Konversi gambar ke skala abu-abu",
+    "Histogram Equalization": "Pemerataan histogram standar",
+    "Threshold (Binary)": "Konversi ke gambar biner hitam-putih",
+    "Blurring/Smoothing": "Berbagai teknik blur dan smoothing gambar",
+    "Edge Detection": "Berbagai teknik deteksi tepi pada gambar",
+    "Morphology (Open)": "Operasi morfologi opening",
+    "Morphology (Close)": "Operasi morfologi closing",
+    "Dilation": "Operasi dilasi (memperbesar objek)",
+    "Erosion": "Operasi erosi (memperkecil objek)",
+    "Brightness/Contrast Adjustment": "Penyesuaian brightness dan contrast",
+    "Sharpen / Contrast": "Penajaman dan peningkatan kontras"
+}
+
+BLUR_TYPES = ["Gaussian Blur", "Median Blur", "Mean Blur", "Bilateral Filter"]
+EDGE_TYPES = ["Canny", "Sobel", "Laplacian"]
+# float64 = referensi (perilaku asli); float32/int16 = jalur cepat untuk
+# Sobel dan Laplacian. Metode lain mengabaikan precision (lihat uses_precision)
+PRECISIONS = ["float64", "float32", "int16"]
+# Engine untuk Median/Bilateral: exact = OpenCV, fast = aproksimasi,
+# auto = fast hanya untuk kernel besar di jalur live/kamera (lihat live_spec),
+# exact untuk gambar diam, render dan file yang disimpan
+BLUR_ENGINES = ["auto", "exact", "fast"]
+FAST_MEDIAN_MIN_KERNEL = 9
+FAST_BILATERAL_MIN_D = 15
+# Structuring element morfologi. Ellipse dan Cross besar didekomposisi
+# (lihat erode_dilate); Rectangle dan garis sudah separable di OpenCV
+MORPH_SHAPES = ["Rectangle", "Cross", "Ellipse", "Horizontal Line", "Vertical Line"]
+FAST_MORPH_MIN_SIZE = 15
+
+
+@dataclass(frozen=True)
+class ProcessSpec:
+    """Method name plus the full parameter set (defaults match the GUI widgets)."""
+    method: str = METHODS[0]
+    blur_type: str = "Gaussian Blur"
+    kernel: int = 3
+    bilateral_d: int = 9
+    sigma: int = 75
+    edge_type: str = "Canny"
+    canny_t1: int = 100
+    canny_t2: int = 200
+    sobel_k: int = 3
+    thresh: int = 127
+    brightness: float = 0.0
+    contrast: float = 1.0
+    sharpen: int = 100
+    precision: str = PRECISIONS[0]
+    blur_engine: str = BLUR_ENGINES[0]
+    morph_shape: str = MORPH_SHAPES[0]
+    morph_size: int = 3
+    morph_iterations: int = 1
+    morph_thresh: int = 127
+
+    def with_method(self, method):
+        return replace(self, method=method)
+
+
+SPEC_FIELDS = tuple(f.name for f in fields(ProcessSpec))
+
+
+def spec_from_dict(values):
+    """Build a ProcessSpec from a plain dict (e.g. CLI args or JSON), casting types."""
+    kwargs = {}
+    for f in fields(ProcessSpec):
+        if f.name in values and values[f.name] is not None:
+            kwargs[f.name] = type(f.default)(values[f.name])
+    spec = ProcessSpec(**kwargs)
+    if spec.method not in REGISTRY:
+        raise ValueError(f"Unknown method: {spec.method}")
+    if spec.blur_type not in BLUR_TYPES:
+        raise ValueError(f"Unknown blur type: {spec.blur_type}")
+    if spec.edge_type not in EDGE_TYPES:
+        raise ValueError(f"Unknown edge type: {spec.edge_type}")
+    if spec.precision not in PRECISIONS:
+        raise ValueError(f"Unknown precision: {spec.precision}")
+    if spec.blur_engine not in BLUR_ENGINES:
+        raise ValueError(f"Unknown blur engine: {spec.blur_engine}")
+    if spec.morph_shape not in MORPH_SHAPES:
+        raise ValueError(f"Unknown structuring element: {spec.morph_shape}")
+    return spec
+
+
+def odd_kernel(k):
+    """Clamp a kernel size to an odd value >= 1, like the original sliders did."""
+    k = int(k)
+    if k % 2 == 0:
+        k += 1
+    if k < 1:
+        k = 1
+    return k
+
+
+def to_gray(img):
+    """BGR -> gray; a single-channel image is returned as is (no copy)."""
+    if img.ndim == 2:
+        return img
+    return cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+
+
+class FrameData:
+    """Data derived from one frame, each item computed on first use only.
+
+    Holds the gray image, binary masks per threshold, the histograms, the
+    gray CDF and the equalization LUT. The pixels of ``img`` must not
+    change while the object is in use; make a new FrameData for a new
+    frame. Returned arrays are shared, treat them as read-only. Two threads
+    filling the same item at once only compute it twice.
+    """
+
+    def __init__(self, img, gray=None):
+        self.img = img
+        self._gray = gray
+        self._items = {}
+
+    def _get(self, key, compute):
+        value = self._items.get(key)
+        if value is None:
+            value = self._items[key] = compute()
+        return value
+
+    @property
+    def gray(self):
+        if self._gray is None:
+            self._gray = to_gray(self.img)
+        return self._gray
+
+    def binary(self, thresh=127):
+        """``gray > thresh`` as 0/255 (cv2.THRESH_BINARY)."""
+        thresh = int(thresh)
+        return self._get(("binary", thresh),
+                         lambda: cv2.threshold(self.gray, thresh, 255, cv2.THRESH_BINARY)[1])
+
+    def gray_histogram(self):
+        """256-bin float32 histogram of the gray image."""
+        return self._get("gray_hist", lambda: cv2.calcHist([self.gray], [0], None, [256], [0, 256]).ravel())
+
+    def histograms(self, per_channel=True):
+        """``[gray]`` or ``[blue, green, red]`` 256-bin histograms."""
+        if self.img.ndim == 2 or not per_channel:
+            return [self.gray_histogram()]
+        return self._get("channel_hists", lambda: [
+            cv2.calcHist([self.img], [c], None, [256], [0, 256]).ravel() for c in range(self.img.shape[2])])
+
+    def cdf(self):
+        """Cumulative gray histogram (pixel counts, float64)."""
+        return self._get("cdf", lambda: np.cumsum(self.gray_histogram(), dtype=np.float64))
+
+    def equalize_lut(self):
+        """LUT that reproduces cv2.equalizeHist on the gray image."""
+        return self._get("equalize_lut", self._equalize_lut)
+
+    def _equalize_lut(self):
+        # Algoritma yang sama dengan equalizeHist: bin terisi pertama -> 0,
+        # sisanya (cdf - hist[first]) * 255 / (total - hist[first]) dalam float32
+        hist = self.gray_histogram()
+        cdf = self.cdf()
+        lut = np.zeros(256, np.uint8)
+        nonzero = np.flatnonzero(hist)
+        if not len(nonzero):
+            return lut
+        first = nonzero[0]
+        total = cdf[-1]
+        if hist[first] == total:
+            lut[:] = first
+            return lut
+        scale = np.float32(255.0 / (total - hist[first]))
+        counts = (cdf[first + 1:] - cdf[first]).astype(np.float32)
+        lut[first + 1:] = np.clip(np.rint(counts * scale), 0, 255)
+        return lut
+
+
+def uses_precision(spec):
+    """True when ``spec.precision`` changes the computation (Sobel/Laplacian edges)."""
+    return spec.method == "Edge Detection" and spec.edge_type in ("Sobel", "Laplacian")
+
+
+def spec_label(spec):
+    """Short human readable summary of a spec, e.g. for a stage list."""
+    label = _method_label(spec)
+    if spec.precision != PRECISIONS[0] and uses_precision(spec):
+        label += f" [{spec.precision}]"
+    return label
+
+
+def _method_label(spec):
+    m = spec.method
+    if m == "Blurring/Smoothing":
+        fast = ", fast" if blur_engine_for(spec) == "fast" else ""
+        if spec.blur_type == "Bilateral Filter":
+            return f"{m} ({spec.blur_type}, d={spec.bilateral_d}, sigma={spec.sigma}{fast})"
+        return f"{m} ({spec.blur_type}, k={spec.kernel}{fast})"
+    if m == "Edge Detection":
+        if spec.edge_type == "Canny":
+            return f"{m} (Canny, {spec.canny_t1}/{spec.canny_t2})"
+        if spec.edge_type == "Sobel":
+            return f"{m} (Sobel, k={spec.sobel_k})"
+        return f"{m} ({spec.edge_type})"
+    if m == "Threshold (Binary)":
+        return f"{m} (t={spec.thresh})"
+    if m in _MORPH_OPS:
+        size, iterations = morph_params(spec)
+        reps = f" x{iterations}" if iterations > 1 else ""
+        fast = ", fast" if spec.morph_shape == "Ellipse" and size >= FAST_MORPH_MIN_SIZE else ""
+        return f"{m} ({spec.morph_shape} {size}{reps}, t={spec.morph_thresh}{fast})"
+    if m == "Brightness/Contrast Adjustment":
+        return f"{m} (b={spec.brightness:g}, c={spec.contrast:g})"
+    return m
+
+
+# Registry: nama metode -> fungsi(img, spec, data) -> ndarray
+# data: FrameData dari img (gray, mask biner, histogram, ... dihitung sekali)
+REGISTRY = {}
+
+
+def register(*names):
+    def deco(fn):
+        for name in names:
+            REGISTRY[name] = fn
+        return fn
+    return deco
+
+
+@register("Image Negative")
+def _negative(img, spec, data):
+    return cv2.bitwise_not(img)
+
+
+@register("Grayscale")
+def _grayscale(img, spec, data):
+    gray = data.gray
+    return gray.copy() if gray is img else gray
+
+
+@register("Histogram Equalization")
+def _equalize(img, spec, data):
+    return cv2.LUT(data.gray, data.equalize_lut())
+
+
+@register("Threshold (Binary)")
+def _threshold(img, spec, data):
+    return data.binary(spec.thresh)
+
+
+def blur_engine_for(spec, live=False):
+    """Resolve ``spec.blur_engine`` to "exact" or "fast" for this blur type and size.
+
+    ``auto`` picks the approximation for large kernels only when ``live``;
+    ``process`` always resolves with ``live=False``.
+    """
+    if spec.blur_type == "Median Blur":
+        large = odd_kernel(spec.kernel) >= FAST_MEDIAN_MIN_KERNEL
+    elif spec.blur_type == "Bilateral Filter":
+        large = int(spec.bilateral_d) >= FAST_BILATERAL_MIN_D
+    else:
+        return "exact"
+    if spec.blur_engine == "fast" or (spec.blur_engine == "auto" and large and live):
+        return "fast"
+    return "exact"
+
+
+def live_spec(spec):
+    """``spec`` for a live/camera stream: ``auto`` becomes ``fast`` where the
+    approximation pays off (max error ~130-145 levels, PSNR ~27-33 dB)."""
+    if spec.blur_engine == "auto" and blur_engine_for(spec, live=True) == "fast":
+        return replace(spec, blur_engine="fast")
+    return spec
+
+
+def fast_median(img, k):
+    """Approximate median for large ``k``: median on a downscaled copy, then upscale.
+
+    medianBlur is already O(1) per pixel for k > 5, but that histogram path
+    costs ~0.25 s per 1080p frame regardless of k; downscaling until the
+    kernel fits the k <= 5 sorting-network path is ~20x faster.
+    """
+    f = -(-k // 5)
+    if f <= 1:
+        return cv2.medianBlur(img, k)
+    h, w = img.shape[:2]
+    small = cv2.resize(img, (max(1, round(w / f)), max(1, round(h / f))), interpolation=cv2.INTER_AREA)
+    small = cv2.medianBlur(small, min((k // f) | 1, 5))
+    return cv2.resize(small, (w, h), interpolation=cv2.INTER_LINEAR)
+
+
+def fast_bilateral(img, d, sigma):
+    """Edge-preserving approximation of bilateralFilter (fast guided filter).
+
+    Each channel guides itself; the linear coefficients are computed with
+    box filters on a copy downscaled by ``r // 4``. Radius and eps were
+    fitted against cv2.bilateralFilter (see bench.py --accuracy).
+    """
+    r = max(int(d) // 4, 1)
+    f = max(r // 4, 1)
+    eps = 0.05 * (float(sigma) / 255.0) ** 2
+    h, w = img.shape[:2]
+    guide = img.astype(np.float32) * (1.0 / 255.0)
+    small = guide
+    if f > 1:
+        small = cv2.resize(guide, (max(1, w // f), max(1, h // f)), interpolation=cv2.INTER_AREA)
+    ksize = (2 * max(round(r / f), 1) + 1,) * 2
+    mean = cv2.boxFilter(small, -1, ksize)
+    var = cv2.boxFilter(small * small, -1, ksize) - mean * mean
+    a = var / (var + eps)
+    b = mean - a * mean
+    a = cv2.boxFilter(a, -1, ksize)
+    b = cv2.boxFilter(b, -1, ksize)
+    if f > 1:
+        a = cv2.resize(a, (w, h), interpolation=cv2.INTER_LINEAR)
+        b = cv2.resize(b, (w, h), interpolation=cv2.INTER_LINEAR)
+    return cv2.convertScaleAbs(a * guide + b, alpha=255.0)
+
+
+@register("Blurring/Smoothing")
+def _blur(img, spec, data):
+    if spec.blur_type == "Gaussian Blur":
+        k = odd_kernel(spec.kernel)
+        return cv2.GaussianBlur(img, (k, k), 0)
+    elif spec.blur_type == "Median Blur":
+        k = odd_kernel(spec.kernel)
+        if blur_engine_for(spec) == "fast":
+            return fast_median(img, k)
+        return cv2.medianBlur(img, k)
+    elif spec.blur_type == "Mean Blur":
+        k = max(int(spec.kernel), 1)
+        return cv2.blur(img, (k, k))
+    elif spec.blur_type == "Bilateral Filter":
+        d = int(spec.bilateral_d)
+        sigma = int(spec.sigma)
+        if blur_engine_for(spec) == "fast":
+            return fast_bilateral(img, d, sigma)
+        return cv2.bilateralFilter(img, d, sigma, sigma)
+    raise ValueError(f"Unknown blur type: {spec.blur_type}")
+
+
+# Batas ksize agar Sobel CV_16S tidak overflow pada input 8-bit
+# (ksize 7: jumlah |koefisien| 1280 * 255 > 32767)
+_INT16_SOBEL_MAX_K = 5
+
+
+def sobel_magnitude(gray, spec):
+    """Gradient magnitude sqrt(gx^2 + gy^2) used by the Sobel edge type.
+
+    float64 is the reference; float32 and int16 return a float32 magnitude
+    from ``cv2.magnitude``. int16 gradients fall back to float32 for
+    kernels that could overflow.
+    """
+    k = odd_kernel(spec.sobel_k)
+    if spec.precision == "float64":
+        sobelx = cv2.Sobel(gray, cv2.CV_64F, 1, 0, ksize=k)
+        sobely = cv2.Sobel(gray, cv2.CV_64F, 0, 1, ksize=k)
+        return np.sqrt(sobelx**2 + sobely**2)
+    if spec.precision == "int16" and k <= _INT16_SOBEL_MAX_K:
+        sobelx = cv2.Sobel(gray, cv2.CV_16S, 1, 0, ksize=k).astype(np.float32)
+        sobely = cv2.Sobel(gray, cv2.CV_16S, 0, 1, ksize=k).astype(np.float32)
+    else:
+        sobelx = cv2.Sobel(gray, cv2.CV_32F, 1, 0, ksize=k)
+        sobely = cv2.Sobel(gray, cv2.CV_32F, 0, 1, ksize=k)
+    return cv2.magnitude(sobelx, sobely)
+
+
+def magnitude_peak(sobel):
+    """Maximum of a magnitude image (one minMaxLoc pass for the fast paths)."""
+    if sobel.dtype == np.float64:
+        return np.max(sobel)
+    return cv2.minMaxLoc(sobel)[1]
+
+
+def normalize_magnitude(sobel, peak):
+    """Scale a magnitude image to 0..255 by its (possibly global) ``peak``.
+
+    A float64 magnitude keeps the reference code; the float32 one is scaled
+    and converted in a single convertScaleAbs pass, with a -0.5 offset so
+    its rounding matches the reference truncation.
+    """
+    if peak <= 0:
+        return np.zeros(sobel.shape, dtype=np.uint8)
+    if sobel.dtype == np.float64:
+        return np.uint8(255 * sobel / peak)
+    return cv2.convertScaleAbs(sobel, alpha=255.0 / peak, beta=-0.5)
+
+
+def _laplacian(gray, precision):
+    if precision == "float64":
+        return np.uint8(np.absolute(cv2.Laplacian(gray, cv2.CV_64F)))
+    # Laplacian ksize 1 pada 8-bit berada di [-1020, 1020], jadi CV_16S dan
+    # CV_32F eksak; astype(uint8) membungkus nilai > 255 seperti referensi
+    ddepth = cv2.CV_16S if precision == "int16" else cv2.CV_32F
+    return np.abs(cv2.Laplacian(gray, ddepth)).astype(np.uint8)
+
+
+@register("Edge Detection")
+def _edges(img, spec, data):
+    gray = data.gray
+    if spec.edge_type == "Canny":
+        return cv2.Canny(gray, int(spec.canny_t1), int(spec.canny_t2))
+    elif spec.edge_type == "Sobel":
+        sobel = sobel_magnitude(gray, spec)
+        return normalize_magnitude(sobel, magnitude_peak(sobel))
+    elif spec.edge_type == "Laplacian":
+        return _laplacian(gray, spec.precision)
+    raise ValueError(f"Unknown edge type: {spec.edge_type}")
+
+
+_MORPH_OPS = {
+    "Morphology (Open)": cv2.MORPH_OPEN,
+    "Morphology (Close)": cv2.MORPH_CLOSE,
+    "Dilation": cv2.MORPH_DILATE,
+    "Erosion": cv2.MORPH_ERODE,
+}
+
+
+_MORPH_SHAPE_FLAGS = {
+    "Rectangle": cv2.MORPH_RECT,
+    "Cross": cv2.MORPH_CROSS,
+    "Ellipse": cv2.MORPH_ELLIPSE,
+}
+
+
+def morph_params(spec):
+    """``(size, iterations)`` of a morphology spec, clamped to >= 1."""
+    return max(int(spec.morph_size), 1), max(int(spec.morph_iterations), 1)
+
+
+def structuring_element(shape, size):
+    """The exact ``size`` x ``size`` structuring element (a 1-pixel line for the line shapes)."""
+    if shape == "Horizontal Line":
+        return np.ones((1, size), np.uint8)
+    if shape == "Vertical Line":
+        return np.ones((size, 1), np.uint8)
+    return cv2.getStructuringElement(_MORPH_SHAPE_FLAGS[shape], (size, size))
+
+
+_RECT3 = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))
+_CROSS3 = cv2.getStructuringElement(cv2.MORPH_CROSS, (3, 3))
+
+
+def fast_disk(img, radius, dilate):
+    """Approximate erosion/dilation by a disk of ``radius`` with small elements.
+
+    Minkowski sum of ``n`` 3x3 squares and ``radius - n`` 3x3 crosses is an
+    octagon; n = (sqrt(2) - 1) * radius puts its diagonal edges on the
+    circle. OpenCV merges the square iterations into one separable
+    rectangle, so the cost grows with the number of cross passes only,
+    instead of with the area of the disk (~0.2% differing pixels, ~10x
+    faster at radius 25..37; see bench.py --morphology).
+    """
+    op = cv2.dilate if dilate else cv2.erode
+    squares = round((2 ** 0.5 - 1) * radius)
+    if squares:
+        img = op(img, _RECT3, iterations=squares)
+    if radius > squares:
+        img = op(img, _CROSS3, iterations=radius - squares)
+    return img
+
+
+def erode_dilate(img, shape, size, iterations, dilate):
+    """Erode (or dilate) ``img`` ``iterations`` times with a ``shape`` element of ``size``.
+
+    Rectangles and lines go straight to OpenCV, which already filters them
+    as separable 1-D passes. Large crosses are the union of a horizontal
+    and a vertical line (exact), large ellipses use fast_disk.
+    """
+    op = cv2.dilate if dilate else cv2.erode
+    if size >= FAST_MORPH_MIN_SIZE and shape == "Cross":
+        combine = cv2.max if dilate else cv2.min
+        horizontal = structuring_element("Horizontal Line", size)
+        vertical = structuring_element("Vertical Line", size)
+        for _ in range(iterations):
+            img = combine(op(img, horizontal), op(img, vertical))
+        return img
+    if size >= FAST_MORPH_MIN_SIZE and shape == "Ellipse":
+        return fast_disk(img, (size // 2) * iterations, dilate)
+    return op(img, structuring_element(shape, size), iterations=iterations)
+
+
+@register(*_MORPH_OPS)
+def _morphology(img, spec, data):
+    th = data.binary(spec.morph_thresh)
+    size, iterations = morph_params(spec)
+    op = _MORPH_OPS[spec.method]
+    # Opening = erosi lalu dilasi, closing = kebalikannya (sama seperti morphologyEx)
+    if op in (cv2.MORPH_ERODE, cv2.MORPH_OPEN):
+        th = erode_dilate(th, spec.morph_shape, size, iterations, dilate=False)
+    if op != cv2.MORPH_ERODE:
+        th = erode_dilate(th, spec.morph_shape, size, iterations, dilate=True)
+    if op == cv2.MORPH_CLOSE:
+        th = erode_dilate(th, spec.morph_shape, size, iterations, dilate=False)
+    return th
+
+
+@register("Brightness/Contrast Adjustment")
+def _brightness_contrast(img, spec, data):
+    # convertScaleAbs sudah menghitung dalam float32 dengan SIMD; LUT justru
+    # lebih lambat di sini. precision tidak berpengaruh
+    return cv2.convertScaleAbs(img, alpha=float(spec.contrast), beta=float(spec.brightness))
+
+
+# filter2D menghitung kernel 8-bit dalam float32 apa pun tipe kernelnya,
+# jadi hasilnya sama dengan kernel asli; precision tidak berpengaruh
+_SHARPEN_KERNEL = np.array([[0, -1, 0], [-1, 5, -1], [0, -1, 0]], dtype=np.float32)
+
+
+@register("Sharpen / Contrast")
+def _sharpen(img, spec, data):
+    # filter2D ke uint8 sudah saturasi; convertScaleAbs(alpha=1, beta=0) yang
+    # dulu dipanggil sesudahnya hanya menyalin gambar, jadi dihapus
+    return cv2.filter2D(img, -1, _SHARPEN_KERNEL)
+
+
+def decode_image(data):
+    """Decode encoded image bytes (PNG, JPEG, ...); returns None if undecodable."""
+    buf = data
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        buf = np.frombuffer(data, dtype=np.uint8)
+    if buf.size == 0:
+        return None
+    return cv2.imdecode(buf, cv2.IMREAD_COLOR)
+
+
+def encode_image(img, ext=".png"):
+    """Encode ``img`` in the format of ``ext`` and return the bytes buffer."""
+    ok, buf = cv2.imencode(ext, img)
+    if not ok:
+        raise ValueError(f"Cannot encode image as {ext}")
+    return buf
+
+
+def read_image(path):
+    """Decode an image file; np.fromfile keeps unicode paths working on Windows."""
+    return decode_image(np.fromfile(path, dtype=np.uint8))
+
+
+def write_image(path, img):
+    """Encode ``img`` by the file extension of ``path`` and write it out."""
+    encode_image(img, os.path.splitext(path)[1] or ".png").tofile(path)
+
+
+def process(img, spec, gray=None, data=None):
+    """Run the operation described by ``spec`` on ``img`` and return the result.
+
+    ``data`` (a FrameData of ``img``) or ``gray`` (its gray version) let
+    callers running several operations on the same input derive gray,
+    masks and histograms only once. The result may share memory with
+    ``data``; treat it as read-only.
+    """
+    if img is None:
+        return None
+    fn = REGISTRY.get(spec.method)
+    if fn is None:
+        return img.copy()
+    return fn(img, spec, data if data is not None else FrameData(img, gray))
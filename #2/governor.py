@@ -0,0 +1,148 @@
+"""
+Governor kualitas adaptif untuk mode kamera.
+
+Waktu proses per frame diukur (rata-rata bergerak eksponensial) dan
+dibandingkan dengan budget 1000 / target_fps ms. Kalau budget terlampaui,
+kualitas turun satu level: pertama engine blur cepat, lalu resolusi proses
+diperkecil (hasil diperbesar lagi untuk tampilan). Kalau ada cukup ruang,
+kualitas naik lagi.
+
+Supaya tidak bolak-balik, setiap level ditahan minimal ``hold_frames``
+frame (kecuali frame lebih dari dua kali budget), dan biaya terukur sebuah
+level diingat: level yang terbukti terlalu mahal baru dicoba lagi setelah
+``retry_frames`` frame.
+"""
+import time
+from dataclasses import replace
+
+import cv2
+
+from proxy import scale_spec
+
+# (skala resolusi proses, engine blur cepat)
+QUALITY_LEVELS = (
+    (1.0, False),
+    (1.0, True),
+    (0.75, True),
+    (0.5, True),
+    (0.35, True),
+    (0.25, True),
+)
+
+
+def degrade_specs(specs, scale, fast):
+    """``specs`` as run at ``scale`` of the frame size, optionally with fast blur engines."""
+    if fast:
+        specs = tuple(replace(s, blur_engine="fast") if s.method == "Blurring/Smoothing" else s
+                      for s in specs)
+    return tuple(scale_spec(s, scale) for s in specs)
+
+
+class QualityGovernor:
+    """Picks a quality level per frame so processing fits a frame-time budget.
+
+    Not thread-safe: ``plan``/``observe`` are called from the processing
+    thread, other threads only read ``level`` and ``describe()``.
+    """
+
+    def __init__(self, target_fps=30.0, levels=QUALITY_LEVELS, alpha=0.2, headroom=0.75,
+                 hold_frames=10, retry_frames=150):
+        self.budget_ms = 1000.0 / target_fps
+        self.levels = levels
+        self.alpha = alpha
+        self.headroom = headroom
+        self.hold_frames = hold_frames
+        self.retry_frames = retry_frames
+        self.level = 0
+        self.ewma_ms = None
+        # Bagian dari ewma_ms untuk resize turun/naik; tidak ikut skala piksel
+        self.resize_ms = 0.0
+        self._frames = 0
+        self._since_change = 0
+        # level -> (biaya rata-rata ms, nomor frame saat diukur)
+        self._cost = {}
+        self._specs = None
+
+    def plan(self, specs):
+        """``(scale, specs)`` to use for the next frame.
+
+        Different ``specs`` than last time (the operator changed a parameter)
+        invalidate everything measured so far, but keep the current level.
+        """
+        if specs != self._specs:
+            self._specs = specs
+            self._cost.clear()
+            self.ewma_ms = None
+            self.resize_ms = 0.0
+            self._since_change = 0
+        scale, fast = self.levels[self.level]
+        return scale, degrade_specs(specs, scale, fast)
+
+    def observe(self, ms, resize_ms=0.0):
+        """Record the processing time of one frame (``resize_ms`` of it spent
+        resizing); True when the level changed."""
+        self._frames += 1
+        self._since_change += 1
+        if self.ewma_ms is None:
+            self.ewma_ms, self.resize_ms = ms, resize_ms
+        else:
+            self.ewma_ms += self.alpha * (ms - self.ewma_ms)
+            self.resize_ms += self.alpha * (resize_ms - self.resize_ms)
+        settled = self._since_change >= self.hold_frames
+        # Jauh di atas budget (mis. bilateral besar, beberapa detik per frame):
+        # turun tanpa menunggu, satu frame per level
+        severe = self.ewma_ms > 2 * self.budget_ms
+        if self.ewma_ms > self.budget_ms and (settled or severe) and self.level < len(self.levels) - 1:
+            return self._move(+1)
+        if settled and self.level > 0 and self._predicted(self.level - 1) < self.headroom * self.budget_ms:
+            return self._move(-1)
+        return False
+
+    def _predicted(self, level):
+        # Biaya level lain: hasil ukur yang masih baru, atau perkiraan dari
+        # perbandingan jumlah piksel (resize hanya ada di bawah skala 1.0)
+        known = self._cost.get(level)
+        if known is not None and self._frames - known[1] < self.retry_frames:
+            return known[0]
+        scale = self.levels[level][0]
+        ratio = (scale / self.levels[self.level][0]) ** 2
+        resize = self.resize_ms if scale != 1.0 else 0.0
+        return (self.ewma_ms - self.resize_ms) * ratio + resize
+
+    def _move(self, step):
+        self._cost[self.level] = (self.ewma_ms, self._frames)
+        self.level += step
+        self.ewma_ms = None
+        self._since_change = 0
+        return True
+
+    def process(self, pipeline, frame, specs):
+        """Run ``specs`` on ``frame`` through ``pipeline`` at the current level and time it.
+
+        The result is resized back to the frame size, so callers see the
+        same shape at every level.
+        """
+        start = time.perf_counter()
+        scale, specs = self.plan(specs)
+        h, w = frame.shape[:2]
+        small = frame
+        if scale != 1.0:
+            size = (max(1, round(w * scale)), max(1, round(h * scale)))
+            small = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+        run_start = time.perf_counter()
+        pipeline.set_stages(specs)
+        result = pipeline.run(small)
+        run_end = time.perf_counter()
+        if result.shape[:2] != (h, w):
+            result = cv2.resize(result, (w, h), interpolation=cv2.INTER_LINEAR)
+        total = time.perf_counter() - start
+        self.observe(total * 1000, (total - (run_end - run_start)) * 1000)
+        return result
+
+    def describe(self):
+        """Short status text, e.g. "quality 3/6 (50%, fast blur)"."""
+        scale, fast = self.levels[self.level]
+        if self.level == 0:
+            return f"quality full ({self.budget_ms:.0f} ms budget)"
+        parts = [f"{scale:.0%}"] + (["fast blur"] if fast else [])
+        return f"quality {self.level + 1}/{len(self.levels)} ({', '.join(parts)})"
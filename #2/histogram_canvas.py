@@ -0,0 +1,111 @@
+"""
+Histogram matplotlib untuk GUI.
+
+Modul terpisah karena matplotlib dan backend Qt-nya memakan sebagian besar
+waktu startup; app.py baru mengimpornya saat histogram pertama ditampilkan.
+"""
+import numpy as np
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
+
+from engine import FrameData
+
+
+class HistogramCanvas(FigureCanvas):
+    """Histogram plot that keeps its artists and only updates their data.
+
+    Bins come from cv2.calcHist; the step artists are animated and blitted
+    over a cached background, and a full redraw only happens when the layout
+    (gray/color/empty) or the y-scale has to change.
+    """
+    GRAY_STYLE = (('#495057', None),)
+    COLOR_STYLE = (('#4285f4', 'Blue'), ('#34a853', 'Green'), ('#ea4335', 'Red'))
+
+    def __init__(self, parent=None, width=4, height=2, dpi=100):
+        fig = Figure(figsize=(width, height), dpi=dpi)
+        super().__init__(fig)
+        self.ax = fig.add_subplot(111)
+        self.ax.set_facecolor('#f8f9fa')
+        fig.patch.set_facecolor('#f8f9fa')
+        fig.tight_layout()
+        self._mode = None
+        self._artists = []
+        self._bins = None
+        self._background = None
+        self.mpl_connect('draw_event', self._on_draw)
+
+    def _on_draw(self, event):
+        self._background = self.copy_from_bbox(self.ax.bbox)
+        for artist in self._artists:
+            self.ax.draw_artist(artist)
+
+    def _setup_axes(self, mode):
+        self.ax.clear()
+        self._artists = []
+        self._bins = None
+        self._mode = mode
+        if mode == "empty":
+            self.ax.text(0.5, 0.5, 'No Image', horizontalalignment='center', 
+                         verticalalignment='center', transform=self.ax.transAxes,
+                         fontsize=12, color='gray')
+            self.ax.set_xlim(0, 1)
+            self.ax.set_ylim(0, 1)
+            self.ax.set_xticks([])
+            self.ax.set_yticks([])
+            return
+        
+        style = self.GRAY_STYLE if mode == "gray" else self.COLOR_STYLE
+        edges = np.arange(257)
+        for col, lbl in style:
+            artist = self.ax.stairs(np.zeros(256), edges, fill=True, alpha=0.7,
+                                    color=col, label=lbl, animated=True)
+            self._artists.append(artist)
+        if mode == "gray":
+            self.ax.set_title("Grayscale Histogram", fontsize=10, fontweight='bold', color='#343a40')
+        else:
+            self.ax.legend(fontsize=8, loc='upper right')
+            self.ax.set_title("Color Histogram", fontsize=10, fontweight='bold', color='#343a40')
+        
+        self.ax.set_xlim(0, 255)
+        self.ax.grid(True, alpha=0.3)
+        self.ax.set_facecolor('#f8f9fa')
+        self.ax.tick_params(axis='both', which='major', labelsize=8, colors='#343a40')
+
+    def plot_hist(self, img, per_channel=True, data=None):
+        """Plot the histograms of ``img``; ``data`` may carry its FrameData
+        so already computed histograms are reused."""
+        if img is None:
+            if self._mode != "empty":
+                self._setup_axes("empty")
+                self.draw()
+            return
+        gray_mode = len(img.shape) == 2 or not per_channel
+        data = data if data is not None else FrameData(img)
+        self.plot_bins(data.histograms(per_channel), "gray" if gray_mode else "color")
+
+    def plot_bins(self, bins, mode):
+        """Show precomputed 256-bin histograms; skipped if nothing changed."""
+        full_redraw = False
+        if mode != self._mode:
+            self._setup_axes(mode)
+            full_redraw = True
+        elif self._bins is not None and all(np.array_equal(a, b) for a, b in zip(bins, self._bins)):
+            return
+        self._bins = bins
+        for artist, hist in zip(self._artists, bins):
+            artist.set_data(values=hist)
+        
+        # Skala y hanya diubah kalau puncak keluar batas atau jauh lebih kecil
+        peak = max(float(h.max()) for h in bins) or 1.0
+        _, top = self.ax.get_ylim()
+        if full_redraw or peak > top or peak < 0.5 * top:
+            self.ax.set_ylim(0, peak * 1.1)
+            full_redraw = True
+        
+        if full_redraw or self._background is None:
+            self.draw()
+        else:
+            self.restore_region(self._background)
+            for artist in self._artists:
+                self.ax.draw_artist(artist)
+            self.blit(self.ax.bbox)
@@ -0,0 +1,181 @@
+"""
+Deteksi perubahan untuk kamera yang kebanyakan melihat scene diam.
+
+Setiap frame dibandingkan per tile dengan referensi yang diperkecil
+``factor`` kali. Frame tanpa tile yang berubah tidak diproses sama sekali
+(hasil sebelumnya tetap dipakai). Untuk filter lokal hanya tile yang
+berubah, diperlebar selebar halo pipeline, yang diproses ulang lalu
+ditempel ke salinan hasil sebelumnya; operasi global (Histogram
+Equalization, normalisasi Sobel) selalu dihitung penuh.
+
+Referensi sebuah tile hanya diperbarui saat tile itu diproses ulang, jadi
+perubahan pelan (mis. cahaya) tetap terdeteksi begitu totalnya melewati
+threshold.
+"""
+import cv2
+import numpy as np
+
+from pipeline import Pipeline
+from tiled import halo_for, with_halo
+
+TILE_SIZE = 64
+DOWNSAMPLE = 8
+# Kalau lebih dari porsi tile ini berubah, satu proses penuh lebih murah
+FULL_RECOMPUTE_FRACTION = 0.5
+
+_NEIGHBORS = np.ones((3, 3), np.uint8)
+
+
+def pipeline_halo(specs):
+    """Context a region needs for the whole chain ``specs``, or None if a stage is global."""
+    total = 0
+    for spec in specs:
+        halo = halo_for(spec)
+        # Sobel dinormalisasi dengan puncak seluruh gambar
+        if halo is None or (spec.method == "Edge Detection" and spec.edge_type == "Sobel"):
+            return None
+        total += halo
+    return total
+
+
+class ChangeDetector:
+    """Per-tile change test on a downsampled copy of the frame.
+
+    A tile changed when any downsampled pixel in it, or next to it, differs
+    from the reference by more than ``threshold`` levels in some channel.
+    """
+
+    def __init__(self, threshold=8, tile=TILE_SIZE, factor=DOWNSAMPLE):
+        self.threshold = threshold
+        self.tile = tile
+        self.factor = factor
+        self.cell = max(tile // factor, 1)
+        self.shape = None
+        self.reference = None
+        self._last = None
+
+    def _small(self, frame):
+        h, w = frame.shape[:2]
+        size = (max(1, w // self.factor), max(1, h // self.factor))
+        return cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+
+    def reset(self, frame):
+        """Take ``frame`` as the reference for every tile."""
+        self.shape = frame.shape
+        self.reference = self._small(frame)
+        self._last = None
+
+    def changed(self, frame):
+        """Boolean grid (tile rows x tile columns) of changed tiles, or None without a reference."""
+        if self.reference is None or frame.shape != self.shape:
+            return None
+        small = self._small(frame)
+        diff = cv2.absdiff(small, self.reference)
+        if diff.ndim == 3:
+            # Per channel: warna berbeda bisa punya nilai abu-abu yang sama
+            diff = diff.max(axis=2)
+        _, mask = cv2.threshold(diff, self.threshold, 1, cv2.THRESH_BINARY)
+        # Tepi objek yang hanya menutup sebagian sel tereduksi oleh INTER_AREA
+        # dan bisa lolos threshold; sel di samping perubahan ikut dianggap berubah
+        mask = cv2.dilate(mask, _NEIGHBORS)
+        sh, sw = mask.shape
+        rows, cols = -(-sh // self.cell), -(-sw // self.cell)
+        padded = np.zeros((rows * self.cell, cols * self.cell), np.uint8)
+        padded[:sh, :sw] = mask
+        self._last = small
+        return padded.reshape(rows, self.cell, cols, self.cell).max(axis=(1, 3)) > 0
+
+    def accept(self, grid=None):
+        """Move the reference of the tiles set in ``grid`` (all tiles if None)
+        to the frame last passed to ``changed``."""
+        if grid is None:
+            self.reference = self._last
+            return
+        sh, sw = self.reference.shape[:2]
+        mask = np.repeat(np.repeat(grid, self.cell, axis=0), self.cell, axis=1)[:sh, :sw]
+        self.reference[mask] = self._last[mask]
+
+    def tile_rect(self, row, col0, col1):
+        """Frame rectangle ``(y0, y1, x0, x1)`` of tiles ``col0..col1`` in ``row``.
+
+        The last row/column also covers the few pixels the downsampled copy
+        dropped.
+        """
+        h, w = self.shape[:2]
+        rows, cols = -(-self.reference.shape[0] // self.cell), -(-self.reference.shape[1] // self.cell)
+        y1 = h if row == rows - 1 else min((row + 1) * self.tile, h)
+        x1 = w if col1 == cols - 1 else min((col1 + 1) * self.tile, w)
+        return row * self.tile, y1, col0 * self.tile, x1
+
+
+class IncrementalProcessor:
+    """Reuses or patches the previous result when only part of the scene changed.
+
+    Not thread-safe; meant to be owned by one processing thread.
+    """
+
+    def __init__(self, threshold=8, tile=TILE_SIZE):
+        self.detector = ChangeDetector(threshold, tile)
+        self.pipeline = Pipeline()
+        self.result = None
+        self.specs = None
+        self.static_frames = 0
+        self.partial_frames = 0
+        self.full_frames = 0
+
+    def process(self, frame, specs, run_full, regions=True):
+        """Result for ``frame``, or None when nothing changed since the last result.
+
+        ``run_full(frame)`` computes a whole frame. With ``regions`` False
+        (e.g. the quality governor changes resolution) changed frames are
+        always computed in full.
+        """
+        grid = None
+        if self.result is not None and specs == self.specs:
+            grid = self.detector.changed(frame)
+        if grid is not None and not grid.any():
+            self.static_frames += 1
+            return None
+        halo = pipeline_halo(specs) if regions else None
+        if grid is None or halo is None or grid.mean() > FULL_RECOMPUTE_FRACTION:
+            self.result = run_full(frame)
+            self.specs = specs
+            if grid is None:
+                self.detector.reset(frame)
+            else:
+                self.detector.accept()
+            self.full_frames += 1
+            return self.result
+
+        # Hasil lama mungkin sedang ditampilkan; tempel ke salinannya
+        result = self.result.copy()
+        h, w = frame.shape[:2]
+        self.pipeline.set_stages(specs)
+        for y0, y1, x0, x1 in self._changed_runs(grid):
+            # Perubahan di tile memengaruhi output sampai sejauh halo di sekitarnya
+            y0, y1 = max(0, y0 - halo), min(h, y1 + halo)
+            x0, x1 = max(0, x0 - halo), min(w, x1 + halo)
+            tile, core = with_halo(frame, y0, y1, x0, x1, halo)
+            result[y0:y1, x0:x1] = self.pipeline.run(tile)[core]
+        self.pipeline.set_source(None)
+        self.detector.accept(grid)
+        self.result = result
+        self.partial_frames += 1
+        return result
+
+    def _changed_runs(self, grid):
+        # Tile berubah yang bersebelahan dalam satu baris diproses sebagai satu blok
+        for row, line in enumerate(grid):
+            col = 0
+            while col < len(line):
+                if not line[col]:
+                    col += 1
+                    continue
+                start = col
+                while col + 1 < len(line) and line[col + 1]:
+                    col += 1
+                yield self.detector.tile_rect(row, start, col)
+                col += 1
+
+    def describe(self):
+        return f"static {self.static_frames}, partial {self.partial_frames}, full {self.full_frames}"
@@ -0,0 +1,238 @@
+"""
+Beberapa sumber (kamera, file video, urutan gambar) sekaligus dalam satu grid.
+
+Setiap sumber punya CameraThread dan ProcessSpec lengkap sendiri (default
+dari opsi CLI, bisa ditimpa per sumber dengan --source-spec), tetapi semua
+frame diproses oleh satu pool worker seukuran jumlah core lewat
+FairScheduler: round-robin antar sumber, frame terbaru menang, dan paling
+banyak satu frame per sumber yang sedang diproses. Filter berat di satu
+sumber tidak bisa menghabiskan worker milik sumber lain.
+
+Contoh:
+    python multicam.py 0 1 --method "Edge Detection"
+    python multicam.py 0 rekaman.mp4 "frames/*.png" --method Grayscale -j 4
+    python multicam.py 0 1 --method Grayscale \
+        --source-spec '1={"method": "Edge Detection", "edge_type": "Sobel", "sobel_k": 5}'
+
+Frame kamera dicerminkan seperti di jendela utama (app.py).
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import asdict
+
+import cv2
+
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtWidgets import (
+    QApplication, QComboBox, QGridLayout, QGroupBox, QLabel, QMainWindow, QVBoxLayout, QWidget,
+)
+
+from app import CameraThread, pixmap_from_cv
+from batch import add_spec_arguments, spec_from_args
+from engine import METHODS, live_spec, spec_from_dict
+from pipeline import Pipeline
+from scheduling import FairScheduler, LatestSlot
+
+DISPLAY_FPS = 30
+
+
+class Feed:
+    """One source: its pipeline settings, its own Pipeline and newest result."""
+
+    def __init__(self, key, source, specs):
+        self.key = key
+        self.source = source
+        self.specs = specs
+        # Sama dengan ProcessingThread di app.py: kamera dicerminkan
+        self.mirror = isinstance(source, int)
+        self.pipeline = Pipeline()
+        self.outbox = LatestSlot()
+        self._stamps = deque(maxlen=30)
+
+    def mark_processed(self):
+        self._stamps.append(time.perf_counter())
+
+    def fps(self):
+        """Processed frames per second over the last 30 frames."""
+        stamps = list(self._stamps)
+        if len(stamps) < 2 or stamps[-1] <= stamps[0]:
+            return 0.0
+        return (len(stamps) - 1) / (stamps[-1] - stamps[0])
+
+
+class WorkerPool:
+    """Threads that process frames handed out by a FairScheduler.
+
+    FairScheduler never hands out two frames of the same source at once, so
+    each Feed's Pipeline is only ever used by one worker at a time.
+    """
+
+    def __init__(self, scheduler, feeds, workers=None):
+        self.scheduler = scheduler
+        self.feeds = feeds
+        self.workers = workers or os.cpu_count() or 1
+        self._threads = []
+
+    def start(self):
+        for i in range(self.workers):
+            t = threading.Thread(target=self._work, name=f"multicam-worker-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def _work(self):
+        while True:
+            job = self.scheduler.get()
+            if job is None:
+                break
+            key, frame = job
+            try:
+                feed = self.feeds[key]
+                if feed.mirror:
+                    frame = cv2.flip(frame, 1)
+                feed.pipeline.set_stages(tuple(live_spec(s) for s in feed.specs))
+                result = feed.pipeline.run(frame)
+                feed.mark_processed()
+                feed.outbox.put((frame, result))
+            except Exception as e:
+                print(f"Error processing source {key}: {e}")
+            finally:
+                self.scheduler.done(key)
+
+    def stop(self):
+        self.scheduler.close()
+        for t in self._threads:
+            t.join()
+        self._threads = []
+
+
+class MultiCamWindow(QMainWindow):
+    """Grid of sources with a method selector and FPS / dropped-frame counters per tile"""
+
+    def __init__(self, sources, specs, workers=None):
+        """``specs``: one ProcessSpec per source."""
+        super().__init__()
+        self.setWindowTitle(f"Multi-Camera - {len(sources)} sources")
+        self.scheduler = FairScheduler()
+        self.feeds = {}
+        self.cam_threads = {}
+        self.labels = {}
+        self.status_labels = {}
+
+        central = QWidget()
+        grid = QGridLayout(central)
+        cols = math.ceil(math.sqrt(len(sources)))
+        for key, (source, spec) in enumerate(zip(sources, specs)):
+            self.feeds[key] = Feed(key, source, (spec,))
+            grid.addWidget(self._make_tile(key, source, spec), key // cols, key % cols)
+        self.setCentralWidget(central)
+
+        self.pool = WorkerPool(self.scheduler, self.feeds, workers)
+        self.pool.start()
+        for key, feed in self.feeds.items():
+            self._start_source(key, feed.source)
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start(1000 // DISPLAY_FPS)
+
+    def _make_tile(self, key, source, spec):
+        box = QGroupBox(str(source))
+        layout = QVBoxLayout(box)
+        label = QLabel("Starting...")
+        label.setAlignment(Qt.AlignCenter)
+        label.setMinimumSize(320, 240)
+        label.setStyleSheet("background-color: #000000; color: #ffffff;")
+        combo = QComboBox()
+        combo.addItems(METHODS)
+        combo.setCurrentText(spec.method)
+        combo.currentTextChanged.connect(lambda method, k=key: self.set_method(k, method))
+        status = QLabel("")
+        layout.addWidget(label, 1)
+        layout.addWidget(combo)
+        layout.addWidget(status)
+        self.labels[key] = label
+        self.status_labels[key] = status
+        return box
+
+    def _start_source(self, key, source):
+        self.scheduler.add_source(key)
+        cam = CameraThread(self, source)
+        cam.wants_frame = lambda k=key: self.scheduler.idle(k)
+        # Frame langsung masuk scheduler dari thread kamera
+        cam.on_frame = lambda frame, k=key: self.scheduler.put(k, frame)
+        cam.start()
+        self.cam_threads[key] = cam
+
+    def set_method(self, key, method):
+        feed = self.feeds[key]
+        feed.specs = tuple(s.with_method(method) for s in feed.specs)
+
+    def refresh(self):
+        for key, feed in self.feeds.items():
+            item = feed.outbox.take()
+            if item is not None:
+                label = self.labels[key]
+                label.setPixmap(pixmap_from_cv(item[1], label.width(), label.height()))
+            dropped = self.scheduler.dropped[key] + feed.outbox.dropped + self.cam_threads[key].skipped
+            self.status_labels[key].setText(f"{feed.fps():.1f} FPS | dropped {dropped}")
+
+    def closeEvent(self, event):
+        self.timer.stop()
+        for cam in self.cam_threads.values():
+            cam.stop()
+        self.pool.stop()
+        event.accept()
+
+
+def parse_source(text):
+    """Camera index for digits, otherwise a video file/URL, directory or glob."""
+    return int(text) if text.isdigit() else text
+
+
+def parse_source_spec(text, base):
+    """``"INDEX=JSON"`` -> (index, ProcessSpec); fields missing in JSON come from ``base``."""
+    index, _, values = text.partition("=")
+    values = json.loads(values)
+    if not isinstance(values, dict):
+        raise ValueError("expected a JSON object")
+    return int(index), spec_from_dict({**asdict(base), **values})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Process several cameras / videos at once")
+    parser.add_argument("sources", nargs="+", type=parse_source,
+                        help="camera index, video file/URL, image directory or glob")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count(),
+                        help="processing threads shared by all sources")
+    parser.add_argument("--source-spec", action="append", default=[], metavar="INDEX=JSON",
+                        help="full spec for one source (0-based), e.g. "
+                             "'1={\"method\": \"Edge Detection\", \"edge_type\": \"Sobel\"}'; "
+                             "unset fields use the options below, which apply to every other source")
+    add_spec_arguments(parser)
+    args = parser.parse_args(argv)
+
+    base = spec_from_args(args)
+    specs = [base] * len(args.sources)
+    for text in args.source_spec:
+        try:
+            index, spec = parse_source_spec(text, base)
+        except ValueError as e:
+            parser.error(f"invalid --source-spec {text!r}: {e}")
+        if not 0 <= index < len(args.sources):
+            parser.error(f"invalid --source-spec {text!r}: index must be 0..{len(args.sources) - 1}")
+        specs[index] = spec
+
+    app = QApplication(sys.argv[:1])
+    window = MultiCamWindow(args.sources, specs, args.workers)
+    window.show()
+    return app.exec()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
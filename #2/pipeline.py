@@ -0,0 +1,138 @@
+"""
+Pipeline multi-tahap di atas engine, dengan cache hasil per tahap.
+
+Contoh: Gaussian Blur -> Canny, atau Threshold -> Morphology (Close).
+Kalau parameter tahap N berubah, hanya tahap N sampai akhir yang dihitung
+ulang; data turunan dari output sebuah tahap (gray, mask biner, histogram,
+lihat engine.FrameData) juga disimpan sehingga tidak dihitung dua kali,
+termasuk oleh tampilan histogram. Dua atau lebih operasi titik berturut-turut
+(lihat pointops) dijalankan sebagai satu LUT.
+"""
+from engine import FrameData, process
+from pointops import apply_point_ops, point_run_end
+
+# Penanda output tahap yang dihitung sekaligus dengan tahap sesudahnya (LUT gabungan)
+_FUSED = object()
+
+
+class Pipeline:
+    """Ordered ProcessSpec stages with cached per-stage outputs.
+
+    The source image is tracked by identity: pass a new array object when the
+    pixels change (the GUI and camera paths always do).
+    """
+
+    def __init__(self, stages=()):
+        self._stages = list(stages)
+        self._source = None
+        self._outputs = [None] * len(self._stages)
+        # indeks tahap -> FrameData dari output tahap itu (-1 = gambar sumber)
+        self._data = {}
+        self.recomputed = 0
+
+    @property
+    def stages(self):
+        return tuple(self._stages)
+
+    def __len__(self):
+        return len(self._stages)
+
+    def invalidate(self, start=0):
+        """Drop cached outputs of stage ``start`` and everything after it."""
+        for i in range(start, len(self._outputs)):
+            self._outputs[i] = None
+        for key in [k for k in self._data if k >= start]:
+            del self._data[key]
+
+    def set_stages(self, stages):
+        """Replace the stage list, keeping the cache of the unchanged prefix."""
+        stages = list(stages)
+        first = 0
+        while first < min(len(stages), len(self._stages)) and stages[first] == self._stages[first]:
+            first += 1
+        self._outputs = self._outputs[:first] + [None] * (len(stages) - first)
+        self._stages = stages
+        self.invalidate(first)
+
+    def set_stage(self, index, spec):
+        stages = list(self._stages)
+        stages[index] = spec
+        self.set_stages(stages)
+
+    def append(self, spec):
+        self.set_stages(self._stages + [spec])
+
+    def remove(self, index):
+        stages = list(self._stages)
+        del stages[index]
+        self.set_stages(stages)
+
+    def clear(self):
+        self.set_stages([])
+
+    def set_source(self, img):
+        if img is not self._source:
+            self._source = img
+            self._data.clear()
+            self.invalidate(0)
+
+    def _data_of(self, index, img):
+        data = self._data.get(index)
+        if data is None:
+            data = self._data[index] = FrameData(img)
+        return data
+
+    def data_for(self, img):
+        """FrameData of ``img``, shared with the stages when ``img`` is the
+        source or a cached stage output; a fresh one otherwise."""
+        if img is not None and img is self._source:
+            return self._data_of(-1, img)
+        for i, out in enumerate(self._outputs):
+            if out is img and out is not None:
+                return self._data_of(i, img)
+        return FrameData(img)
+
+    def run(self, img=None, should_cancel=None, progress=None):
+        """Return the output of the last stage, recomputing only stale stages.
+
+        ``should_cancel`` is polled between stages; when it returns True the
+        run stops and None is returned (finished stages stay cached).
+        ``progress(done, total)`` is called after every stage.
+        """
+        if img is not None:
+            self.set_source(img)
+        src = self._source
+        self.recomputed = 0
+        if src is None:
+            return None
+        if not self._stages:
+            return src
+
+        first = 0
+        while first < len(self._outputs) and self._outputs[first] is not None:
+            first += 1
+        # Tahap di tengah rangkaian LUT gabungan tidak punya output sendiri
+        while first > 0 and self._outputs[first - 1] is _FUSED:
+            first -= 1
+        i = first
+        while i < len(self._stages):
+            if should_cancel is not None and should_cancel():
+                return None
+            spec = self._stages[i]
+            inp = src if i == 0 else self._outputs[i - 1]
+            data = self._data_of(i - 1, inp)
+            end = point_run_end(self._stages, i)
+            if end - i > 1:
+                # Satu LUT cv2 lebih lambat dari satu operasi SIMD, jadi hanya
+                # rangkaian >= 2 operasi titik yang digabung
+                for k in range(i, end - 1):
+                    self._outputs[k] = _FUSED
+                self._outputs[end - 1] = apply_point_ops(inp, self._stages[i:end], data)
+            else:
+                end = i + 1
+                self._outputs[i] = process(inp, spec, data=data)
+            self.recomputed += end - i
+            i = end
+            if progress is not None:
+                progress(i, len(self._stages))
+        return self._outputs[-1]
@@ -0,0 +1,87 @@
+"""
+Operasi titik (per piksel) yang digabung menjadi satu lookup table.
+
+Image Negative, Threshold (Binary) dan Brightness/Contrast Adjustment hanya
+memetakan nilai 0..255 ke 0..255, jadi rangkaian operasi tersebut bisa
+dikomposisi menjadi satu LUT 256 entri dan diterapkan dengan satu kali
+``cv2.LUT``. Ketiganya memakai fungsi yang sama untuk setiap channel, jadi
+satu tabel cukup untuk gambar berwarna. LUT di-cache berdasarkan parameter.
+"""
+from functools import lru_cache
+
+import cv2
+import numpy as np
+
+from engine import to_gray
+
+POINT_METHODS = frozenset({"Image Negative", "Threshold (Binary)", "Brightness/Contrast Adjustment"})
+
+_IDENTITY = np.arange(256, dtype=np.uint8)
+
+
+def point_key(spec):
+    """Only the parameters that affect the mapping, so unrelated fields share a LUT."""
+    m = spec.method
+    if m == "Threshold (Binary)":
+        return (m, int(spec.thresh))
+    if m == "Brightness/Contrast Adjustment":
+        return (m, float(spec.brightness), float(spec.contrast))
+    return (m,)
+
+
+@lru_cache(maxsize=256)
+def _op_lut(key):
+    # LUT dibuat dengan fungsi OpenCV yang sama, jadi hasilnya identik
+    m = key[0]
+    if m == "Image Negative":
+        lut = cv2.bitwise_not(_IDENTITY)
+    elif m == "Threshold (Binary)":
+        _, lut = cv2.threshold(_IDENTITY, key[1], 255, cv2.THRESH_BINARY)
+    elif m == "Brightness/Contrast Adjustment":
+        lut = cv2.convertScaleAbs(_IDENTITY, alpha=key[2], beta=key[1])
+    else:
+        raise ValueError(f"{m} is not a point operation")
+    lut = lut.ravel()
+    lut.flags.writeable = False
+    return lut
+
+
+@lru_cache(maxsize=256)
+def compile_lut(keys):
+    """Compose the point operations ``keys`` (in order) into one 256-entry LUT."""
+    lut = _IDENTITY
+    for key in keys:
+        lut = _op_lut(key)[lut]
+    lut = np.ascontiguousarray(lut)
+    lut.flags.writeable = False
+    return lut
+
+
+def point_run_end(specs, start):
+    """End index (exclusive) of the run of point operations beginning at ``start``."""
+    end = start
+    while end < len(specs) and specs[end].method in POINT_METHODS:
+        end += 1
+    return end
+
+
+def apply_point_ops(img, specs, data=None):
+    """Apply a sequence of point-operation specs with as few passes as possible.
+
+    Threshold works on the gray image, so on a color input the LUT built so
+    far is applied first and the image converted; that is the only place a
+    chain needs a second pass. ``data`` may carry the FrameData of ``img``
+    so its gray version is reused.
+    """
+    keys = []
+    for spec in specs:
+        if spec.method == "Threshold (Binary)" and img.ndim == 3:
+            if keys:
+                img = to_gray(cv2.LUT(img, compile_lut(tuple(keys))))
+                keys = []
+            else:
+                img = to_gray(img) if data is None else data.gray
+        keys.append(point_key(spec))
+    if not keys:
+        return img.copy()
+    return cv2.LUT(img, compile_lut(tuple(keys)))
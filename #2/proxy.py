@@ -0,0 +1,46 @@
+"""
+Proxy resolusi rendah untuk preview interaktif gambar besar.
+
+Edit interaktif dijalankan pada versi kecil dari gambar dengan ukuran kernel
+yang diskalakan ikut, sedangkan render resolusi penuh baru dilakukan saat
+disimpan atau diminta.
+"""
+from dataclasses import replace
+
+import cv2
+
+from engine import odd_kernel
+
+# Sisi terpanjang proxy (piksel); gambar yang lebih kecil tidak diproksikan
+PROXY_MAX_SIDE = 1600
+
+
+def make_proxy(img, max_side=PROXY_MAX_SIDE):
+    """Return ``(proxy, scale)``; ``scale`` is 1.0 when no downscaling is needed."""
+    h, w = img.shape[:2]
+    longest = max(h, w)
+    if longest <= max_side:
+        return img, 1.0
+    scale = max_side / longest
+    size = (max(1, round(w * scale)), max(1, round(h * scale)))
+    return cv2.resize(img, size, interpolation=cv2.INTER_AREA), scale
+
+
+def scale_spec(spec, scale):
+    """Rescale the spatial (kernel size) parameters of ``spec`` by ``scale``.
+
+    Odd-only kernels stay odd. Thresholds and the bilateral sigma (which is
+    also the color sigma) are left unchanged; Sobel apertures are limited to
+    1..7 by OpenCV and are not scaled. Morphology iterations are kept, the
+    structuring element shrinks instead.
+    """
+    if scale == 1.0:
+        return spec
+    changes = {}
+    if spec.blur_type in ("Gaussian Blur", "Median Blur"):
+        changes["kernel"] = odd_kernel(round(spec.kernel * scale))
+    elif spec.blur_type == "Mean Blur":
+        changes["kernel"] = max(1, round(spec.kernel * scale))
+    changes["bilateral_d"] = max(1, round(spec.bilateral_d * scale))
+    changes["morph_size"] = max(1, round(spec.morph_size * scale))
+    return replace(spec, **changes)
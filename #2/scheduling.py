@@ -0,0 +1,149 @@
+"""
+Primitif penjadwalan frame yang tidak bergantung pada Qt.
+"""
+import threading
+
+
+class LatestSlot:
+    """Single-slot mailbox where the newest item wins.
+
+    ``put`` never blocks: an item that has not been taken yet is replaced and
+    counted in ``dropped``. ``get`` blocks until an item arrives or the slot is
+    closed, in which case it returns None.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._item = None
+        self._has_item = False
+        self._closed = False
+        self.dropped = 0
+        self.delivered = 0
+
+    def put(self, item):
+        with self._cond:
+            if self._has_item:
+                self.dropped += 1
+            self._item = item
+            self._has_item = True
+            self._cond.notify()
+
+    def get(self, timeout=None):
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._has_item or self._closed, timeout):
+                return None
+            return self._take_locked()
+
+    def take(self):
+        """Non-blocking get; returns None when the slot is empty."""
+        with self._cond:
+            return self._take_locked()
+
+    def _take_locked(self):
+        if not self._has_item:
+            return None
+        item = self._item
+        self._item = None
+        self._has_item = False
+        self.delivered += 1
+        return item
+
+    @property
+    def pending(self):
+        return self._has_item
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
+class FairScheduler:
+    """Latest-frame-wins mailboxes for many sources, served round-robin.
+
+    Each source holds at most one pending frame (newer frames replace it and
+    count as dropped) and at most one frame in flight, so a source with a
+    heavy filter occupies one worker at a time and cannot starve the others
+    however many workers share the scheduler.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._pending = {}
+        self._order = []
+        self._busy = set()
+        self._next = 0
+        self._closed = False
+        self.dropped = {}
+        self.delivered = {}
+
+    def add_source(self, key):
+        with self._cond:
+            if key not in self.dropped:
+                self._order.append(key)
+                self.dropped[key] = 0
+                self.delivered[key] = 0
+
+    def remove_source(self, key):
+        with self._cond:
+            if key in self.dropped:
+                self._order.remove(key)
+                self._pending.pop(key, None)
+                del self.dropped[key], self.delivered[key]
+
+    def put(self, key, item):
+        with self._cond:
+            if key not in self.dropped:
+                return
+            if key in self._pending:
+                self.dropped[key] += 1
+            self._pending[key] = item
+            self._cond.notify()
+
+    def idle(self, key):
+        """True when a frame from ``key`` would be picked up right away."""
+        return key not in self._busy and key not in self._pending
+
+    def _ready_locked(self):
+        n = len(self._order)
+        for i in range(n):
+            key = self._order[(self._next + i) % n]
+            if key in self._pending and key not in self._busy:
+                self._next = (self._next + i + 1) % n
+                return key
+        return None
+
+    def get(self, timeout=None):
+        """Block until some idle source has a frame; returns ``(key, item)`` or None."""
+        with self._cond:
+            key = None
+
+            def ready():
+                nonlocal key
+                key = self._ready_locked()
+                return key is not None or self._closed
+
+            if not self._cond.wait_for(ready, timeout) or key is None:
+                return None
+            self._busy.add(key)
+            self.delivered[key] += 1
+            return key, self._pending.pop(key)
+
+    def done(self, key):
+        """Mark the frame handed out for ``key`` as finished."""
+        with self._cond:
+            self._busy.discard(key)
+            self._cond.notify()
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
@@ -0,0 +1,378 @@
+"""
+Service HTTP lokal: operasi dari METHODS tanpa GUI.
+
+Request dijalankan di thread pool (OpenCV melepas GIL). Jumlah request yang
+sedang diproses + mengantre dibatasi; kalau penuh server langsung menjawab
+503, dan request yang melewati batas waktu dijawab 504.
+
+Endpoint:
+    GET  /methods   katalog metode, pilihan dan parameter default
+    POST /process   body = bytes gambar (PNG/JPEG/...), parameter di query string;
+                    hasil = bytes gambar dalam ``format`` (default .png)
+    POST /batch     body JSON {"spec": {...}, "format": ".png", "images": [base64, ...]}
+    GET  /metrics   jumlah request, status, antrean dan histogram latensi
+    GET  /health
+
+Contoh:
+    python server.py --port 8765 -j 8
+    curl --data-binary @foto.jpg -o hasil.png \
+        "http://127.0.0.1:8765/process?method=Edge%20Detection&edge_type=Sobel"
+"""
+import argparse
+import base64
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from dataclasses import asdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+from engine import (
+    BLUR_ENGINES, BLUR_TYPES, EDGE_TYPES, METHOD_DESCRIPTIONS, METHODS, MORPH_SHAPES, PRECISIONS,
+    ProcessSpec, decode_image, encode_image, process, spec_from_dict,
+)
+
+MAX_BODY_BYTES = 64 * 1024 * 1024
+# Batas atas bucket histogram latensi (ms); bucket terakhir = +Inf
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+
+CONTENT_TYPES = {
+    ".png": "image/png", ".jpg": "image/jpeg", ".jpeg": "image/jpeg", ".bmp": "image/bmp",
+    ".tif": "image/tiff", ".tiff": "image/tiff", ".webp": "image/webp",
+}
+
+
+class Overloaded(Exception):
+    """The worker pool and its queue are full."""
+
+
+class LatencyHistogram:
+    """Per-bucket (non-cumulative) counts plus count and sum of observed latencies."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS_MS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum_ms = 0.0
+
+    def observe(self, ms):
+        i = 0
+        while i < len(self.buckets) and ms > self.buckets[i]:
+            i += 1
+        self.counts[i] += 1
+        self.count += 1
+        self.sum_ms += ms
+
+    def as_dict(self):
+        labels = [str(b) for b in self.buckets] + ["+Inf"]
+        return {
+            "count": self.count,
+            "sum_ms": self.sum_ms,
+            "mean_ms": self.sum_ms / self.count if self.count else 0.0,
+            "buckets_ms": dict(zip(labels, self.counts)),
+        }
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.status = {}
+        self.latency = {}
+
+    def observe(self, key, ms, status=None):
+        with self._lock:
+            hist = self.latency.get(key)
+            if hist is None:
+                hist = self.latency[key] = LatencyHistogram()
+            hist.observe(ms)
+            if status is not None:
+                self.status[str(status)] = self.status.get(str(status), 0) + 1
+
+    def as_dict(self):
+        with self._lock:
+            return {
+                "uptime_s": time.time() - self.started,
+                "status": dict(self.status),
+                "latency": {key: hist.as_dict() for key, hist in self.latency.items()},
+            }
+
+
+class ProcessingService:
+    """Thread pool with a hard limit on running + queued jobs and a per-job timeout.
+
+    A job that times out keeps its slot until it really finishes, so a burst
+    of slow requests cannot pile up more work than ``workers + max_queue``.
+    """
+
+    def __init__(self, workers=None, max_queue=32, timeout=30.0):
+        self.workers = workers or os.cpu_count() or 1
+        self.capacity = self.workers + max_queue
+        self.timeout = timeout
+        self.metrics = Metrics()
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="service")
+        self._slots = threading.BoundedSemaphore(self.capacity)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+
+    def submit(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise Overloaded()
+        with self._lock:
+            self.in_flight += 1
+        future = self._pool.submit(fn, *args)
+        future.add_done_callback(self._release)
+        return future
+
+    def _release(self, _future):
+        with self._lock:
+            self.in_flight -= 1
+        self._slots.release()
+
+    def run_spec(self, img, spec):
+        """Process one image on the calling thread, recording its time per method."""
+        start = time.perf_counter()
+        out = process(img, spec)
+        ms = (time.perf_counter() - start) * 1000
+        self.metrics.observe(f"method:{spec.method}", ms)
+        return out
+
+    def process(self, img, spec):
+        """Run ``spec`` on the pool and wait at most ``timeout`` seconds."""
+        return self.submit(self.run_spec, img, spec).result(timeout=self.timeout)
+
+    def queue_state(self):
+        return {"in_flight": self.in_flight, "capacity": self.capacity, "workers": self.workers}
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _parse_spec(values):
+    if not values.get("method"):
+        raise HttpError(400, "missing 'method'")
+    try:
+        return spec_from_dict(values)
+    except (TypeError, ValueError) as e:
+        raise HttpError(400, str(e))
+
+
+def _normalize_format(fmt):
+    if fmt is not None and not isinstance(fmt, str):
+        raise HttpError(400, "'format' must be a string")
+    fmt = (fmt or ".png").lower()
+    fmt = fmt if fmt.startswith(".") else "." + fmt
+    if fmt not in CONTENT_TYPES:
+        raise HttpError(400, f"unsupported format {fmt}")
+    return fmt
+
+
+def catalog():
+    return {
+        "methods": METHODS,
+        "descriptions": METHOD_DESCRIPTIONS,
+        "blur_types": BLUR_TYPES,
+        "edge_types": EDGE_TYPES,
+        "precisions": PRECISIONS,
+        "blur_engines": BLUR_ENGINES,
+        "morph_shapes": MORPH_SHAPES,
+        "defaults": asdict(ProcessSpec()),
+    }
+
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    server_version = "ImageProcessingService/1.0"
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def service(self):
+        return self.server.service
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    # --- respons ---
+
+    def _send(self, status, body, content_type, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status, obj, headers=None):
+        self._send(status, json.dumps(obj).encode("utf-8"), "application/json", headers)
+
+    def _read_body(self):
+        # rfile.read(-1) akan menunggu sampai koneksi ditutup
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            raise HttpError(400, "Content-Length must be an integer")
+        if length < 0:
+            raise HttpError(400, "Content-Length must not be negative")
+        if length > MAX_BODY_BYTES:
+            raise HttpError(413, f"body larger than {MAX_BODY_BYTES} bytes")
+        return self.rfile.read(length)
+
+    def _dispatch(self, routes):
+        start = time.perf_counter()
+        url = urlsplit(self.path)
+        handler = routes.get(url.path)
+        status = 404
+        try:
+            if handler is None:
+                raise HttpError(404, f"no route {url.path}")
+            status = handler(dict(parse_qsl(url.query)))
+        except HttpError as e:
+            status = e.status
+            self._send_json(status, {"error": str(e)})
+        except Overloaded:
+            status = 503
+            self._send_json(status, {"error": "server busy", **self.service.queue_state()},
+                            {"Retry-After": "1"})
+        except FutureTimeout:
+            status = 504
+            self._send_json(status, {"error": f"processing exceeded {self.service.timeout}s"})
+        except Exception as e:
+            status = 500
+            self._send_json(status, {"error": f"{type(e).__name__}: {e}"})
+        if status >= 400:
+            # Body request mungkin belum terbaca; jangan pakai ulang koneksinya
+            self.close_connection = True
+        ms = (time.perf_counter() - start) * 1000
+        self.service.metrics.observe(f"endpoint:{url.path}", ms, status)
+
+    def do_GET(self):
+        self._dispatch({
+            "/methods": self.get_methods, "/metrics": self.get_metrics, "/health": self.get_health,
+        })
+
+    def do_POST(self):
+        self._dispatch({"/process": self.post_process, "/batch": self.post_batch})
+
+    # --- endpoint ---
+
+    def get_methods(self, query):
+        self._send_json(200, catalog())
+        return 200
+
+    def get_health(self, query):
+        self._send_json(200, {"status": "ok"})
+        return 200
+
+    def get_metrics(self, query):
+        self._send_json(200, {**self.service.metrics.as_dict(), "queue": self.service.queue_state()})
+        return 200
+
+    def post_process(self, query):
+        spec = _parse_spec(query)
+        fmt = _normalize_format(query.get("format"))
+        img = decode_image(self._read_body())
+        if img is None:
+            raise HttpError(400, "body is not a decodable image")
+        start = time.perf_counter()
+        out = self.service.process(img, spec)
+        ms = (time.perf_counter() - start) * 1000
+        body = encode_image(out, fmt).tobytes()
+        self._send(200, body, CONTENT_TYPES[fmt], {"X-Elapsed-Ms": f"{ms:.2f}"})
+        return 200
+
+    def post_batch(self, query):
+        try:
+            payload = json.loads(self._read_body())
+            images = payload["images"]
+        except (ValueError, KeyError, TypeError):
+            raise HttpError(400, "body must be JSON with an 'images' list")
+        # String juga bisa diiterasi, tapi per karakter
+        if not isinstance(images, list):
+            raise HttpError(400, "'images' must be a list of base64 strings")
+        spec = payload.get("spec") or {}
+        if not isinstance(spec, dict):
+            raise HttpError(400, "'spec' must be an object")
+        spec = _parse_spec(spec)
+        fmt = _normalize_format(payload.get("format"))
+
+        # Semua gambar masuk pool sekaligus; gambar yang tidak kebagian slot
+        # mendapat error per item, bukan menggagalkan seluruh batch
+        jobs = []
+        for data in images:
+            try:
+                img = decode_image(base64.b64decode(data))
+            except (ValueError, TypeError):
+                img = None
+            if img is None:
+                jobs.append("not a decodable image")
+                continue
+            try:
+                jobs.append(self.service.submit(self.service.run_spec, img, spec))
+            except Overloaded:
+                jobs.append("server busy")
+        if images and all(job == "server busy" for job in jobs):
+            raise Overloaded()
+
+        deadline = time.monotonic() + self.service.timeout
+        results = []
+        for job in jobs:
+            if isinstance(job, str):
+                results.append({"error": job})
+                continue
+            try:
+                out = job.result(timeout=max(0.0, deadline - time.monotonic()))
+                encoded = encode_image(out, fmt).tobytes()
+                results.append({"image": base64.b64encode(encoded).decode("ascii")})
+            except FutureTimeout:
+                results.append({"error": f"processing exceeded {self.service.timeout}s"})
+            except Exception as e:
+                results.append({"error": f"{type(e).__name__}: {e}"})
+        self._send_json(200, {"format": fmt, "results": results})
+        return 200
+
+
+def make_server(host="127.0.0.1", port=8765, workers=None, max_queue=32, timeout=30.0, verbose=False):
+    """Create (but do not start) the HTTP server; port 0 picks a free port."""
+    server = ThreadingHTTPServer((host, port), ServiceHandler)
+    server.daemon_threads = True
+    server.service = ProcessingService(workers, max_queue, timeout)
+    server.verbose = verbose
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local HTTP image processing service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count(), help="processing threads")
+    parser.add_argument("--max-queue", type=int, default=32, help="requests allowed to wait for a worker")
+    parser.add_argument("--timeout", type=float, default=30.0, help="per-request processing timeout (s)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log every request")
+    args = parser.parse_args(argv)
+
+    server = make_server(args.host, args.port, args.workers, args.max_queue, args.timeout, args.verbose)
+    host, port = server.server_address[:2]
+    print(f"Serving on http://{host}:{port} ({server.service.workers} workers, queue {args.max_queue})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.service.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
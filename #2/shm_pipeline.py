@@ -0,0 +1,253 @@
+"""
+Pipeline video multi-proses dengan ring buffer shared memory.
+
+Capture, pemrosesan dan output (encode / tampilan) berjalan di proses
+terpisah sehingga kode Python per frame tidak lagi berebut satu GIL. Frame
+tidak pernah di-pickle: setiap slot ring adalah potongan
+``multiprocessing.shared_memory`` yang sudah dialokasikan, dan queue hanya
+membawa (nomor urut, indeks slot, shape).
+
+Satu frame memegang slot yang sama di ring input dan ring output dari saat
+di-capture sampai selesai ditulis, jadi worker tidak pernah menunggu slot
+output dan pipeline tidak bisa deadlock. Nomor urut dipakai untuk
+mengembalikan urutan frame di sisi output.
+
+Contoh:
+    python shm_pipeline.py input.mp4 output.mp4 -j 6 \
+        --method "Blurring/Smoothing" --blur-type "Bilateral Filter"
+    python shm_pipeline.py 0 out/frame_%06d.png --method "Edge Detection" --show
+"""
+import argparse
+import multiprocessing as mp
+import os
+import queue
+import sys
+import time
+from multiprocessing import shared_memory
+
+import cv2
+import numpy as np
+
+from batch import add_spec_arguments, spec_from_args
+from pipeline import Pipeline
+from video import open_sink, open_source
+
+_DONE = None
+
+
+class FrameRing:
+    """``slots`` preallocated uint8 frames of ``shape`` in one shared-memory block."""
+
+    def __init__(self, slots, shape, name=None):
+        self.slots = slots
+        self.shape = tuple(shape)
+        self.slot_bytes = int(np.prod(self.shape))
+        create = name is None
+        self.shm = shared_memory.SharedMemory(name=name, create=create, size=slots * self.slot_bytes)
+        self._owner = create
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def view(self, slot, shape=None):
+        """ndarray over slot ``slot`` (no copy); ``shape`` may be smaller than the slot."""
+        shape = self.shape if shape is None else tuple(shape)
+        count = int(np.prod(shape))
+        if count > self.slot_bytes:
+            raise ValueError(f"frame {shape} does not fit a {self.shape} slot")
+        return np.ndarray(shape, dtype=np.uint8, buffer=self.shm.buf, offset=slot * self.slot_bytes)
+
+    def close(self):
+        self.shm.close()
+        if self._owner:
+            self.shm.unlink()
+
+
+def probe_shape(source):
+    """Shape of the first frame of ``source``; the source is released again."""
+    cap = open_source(source)
+    try:
+        ok, frame = cap.read()
+    finally:
+        cap.release()
+    if not ok:
+        raise IOError(f"Cannot read a frame from {source}")
+    return frame.shape
+
+
+def _capture_main(source, ring_name, slots, shape, free_q, work_q, workers, stop, max_frames):
+    ring = FrameRing(slots, shape, ring_name)
+    cap = open_source(source)
+    seq = 0
+    try:
+        while not stop.is_set() and (max_frames is None or seq < max_frames):
+            ok, frame = cap.read()
+            if not ok:
+                break
+            if frame.shape != ring.shape:
+                print(f"Skipping frame {seq}: shape {frame.shape} differs from {ring.shape}")
+                continue
+            slot = free_q.get()
+            ring.view(slot)[...] = frame
+            work_q.put((seq, slot))
+            seq += 1
+    finally:
+        cap.release()
+        for _ in range(workers):
+            work_q.put(_DONE)
+        ring.shm.close()
+
+
+def _worker_main(specs, in_name, out_name, slots, shape, work_q, done_q):
+    cv2.setNumThreads(1)
+    ring_in = FrameRing(slots, shape, in_name)
+    ring_out = FrameRing(slots, shape, out_name)
+    pipeline = Pipeline(specs)
+    try:
+        while True:
+            job = work_q.get()
+            if job is _DONE:
+                break
+            seq, slot = job
+            try:
+                result = pipeline.run(ring_in.view(slot))
+                ring_out.view(slot, result.shape)[...] = result
+                done_q.put((seq, slot, result.shape))
+            except Exception as e:
+                print(f"Error processing frame {seq}: {e}")
+                done_q.put((seq, slot, None))
+            # Lepas referensi ke view slot; shared memory yang masih punya
+            # view aktif tidak bisa ditutup
+            pipeline.set_source(None)
+            result = None
+    finally:
+        done_q.put(_DONE)
+        ring_in.shm.close()
+        ring_out.shm.close()
+
+
+def _drain(q):
+    try:
+        while True:
+            q.get_nowait()
+    except queue.Empty:
+        pass
+
+
+def run_shm_pipeline(source, sink, specs, workers=None, slots=None, max_frames=None,
+                     progress=None, show=False):
+    """Stream ``source`` through ``specs`` with one capture and ``workers`` processing processes.
+
+    The calling process is the consumer: it restores frame order and writes
+    to ``sink`` (and shows the frames if ``show``). Returns the same stats
+    dict as video.run_video.
+    """
+    workers = workers or os.cpu_count() or 1
+    slots = slots or 2 * workers + 2
+    shape = probe_shape(source)
+    ring_in = FrameRing(slots, shape)
+    ring_out = FrameRing(slots, shape)
+    ctx = mp.get_context("spawn")
+    free_q, work_q, done_q = ctx.Queue(), ctx.Queue(), ctx.Queue()
+    for slot in range(slots):
+        free_q.put(slot)
+    stop = ctx.Event()
+
+    capture_args = (source, ring_in.name, slots, shape, free_q, work_q, workers, stop, max_frames)
+    procs = [ctx.Process(target=_capture_main, name="capture", args=capture_args)]
+    procs += [ctx.Process(target=_worker_main, name=f"process-{i}",
+                          args=(specs, ring_in.name, ring_out.name, slots, shape, work_q, done_q))
+              for i in range(workers)]
+    start = time.perf_counter()
+    for p in procs:
+        p.start()
+
+    pending = {}
+    next_seq = 0
+    finished = 0
+    try:
+        while finished < workers:
+            try:
+                item = done_q.get(timeout=1.0)
+            except queue.Empty:
+                if not any(p.is_alive() for p in procs[1:]):
+                    raise RuntimeError("processing workers exited unexpectedly")
+                continue
+            if item is _DONE:
+                finished += 1
+                continue
+            pending[item[0]] = item[1:]
+            while next_seq in pending:
+                slot, out_shape = pending.pop(next_seq)
+                if out_shape is not None and not stop.is_set():
+                    frame = ring_out.view(slot, out_shape)
+                    sink.write(frame)
+                    if show:
+                        cv2.imshow("shm_pipeline", frame)
+                        if cv2.waitKey(1) & 0xFF == ord("q"):
+                            stop.set()
+                    del frame
+                free_q.put(slot)
+                next_seq += 1
+                if progress is not None:
+                    progress(next_seq, time.perf_counter() - start)
+    except BaseException:
+        stop.set()
+        # Kembalikan slot supaya capture yang menunggu free_q bisa berhenti
+        for slot in range(slots):
+            free_q.put(slot)
+        raise
+    finally:
+        for p in procs:
+            # Proses anak baru bisa selesai setelah isi queue-nya terbaca
+            while p.is_alive():
+                p.join(0.1)
+                _drain(done_q)
+        sink.release()
+        if show:
+            cv2.destroyAllWindows()
+        ring_in.close()
+        ring_out.close()
+
+    elapsed = time.perf_counter() - start
+    return {"frames": next_seq, "seconds": elapsed, "fps": next_seq / elapsed if elapsed > 0 else 0.0}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Multiprocess video pipeline over shared memory")
+    parser.add_argument("source", help="video file, camera index, image directory or glob")
+    parser.add_argument("output", help="video file, or a pattern like out/frame_%%06d.png")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count(), help="processing processes")
+    parser.add_argument("--slots", type=int, default=None,
+                        help="frames in the ring (default 2 x workers + 2)")
+    parser.add_argument("--fourcc", default="mp4v", help="FOURCC of the output video")
+    parser.add_argument("--fps", type=float, default=None, help="output FPS (default: source FPS)")
+    parser.add_argument("--max-frames", type=int, default=None)
+    parser.add_argument("--show", action="store_true", help="also display the frames (q quits)")
+    add_spec_arguments(parser)
+    args = parser.parse_args(argv)
+
+    spec = spec_from_args(args)
+    cap = open_source(args.source)
+    if not cap.isOpened():
+        parser.error(f"Cannot open source {args.source}")
+    src_fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    cap.release()
+    sink = open_sink(args.output, args.fps or src_fps, args.fourcc)
+
+    def progress(frames, elapsed):
+        if frames % 30 == 0:
+            sys.stderr.write(f"\r{frames} frames, {frames / elapsed:.1f} FPS")
+            sys.stderr.flush()
+
+    stats = run_shm_pipeline(args.source, sink, (spec,), args.workers, args.slots, args.max_frames,
+                             progress, args.show)
+    sys.stderr.write("\n")
+    print(f"{stats['frames']} frames in {stats['seconds']:.2f}s: {stats['fps']:.1f} FPS "
+          f"({stats['fps'] / src_fps:.1f}x real time at {src_fps:.0f} FPS)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""ResultCache: LRU order, byte budget and content-based keys."""
+import numpy as np
+
+from cache import ResultCache, content_hash
+from engine import ProcessSpec
+
+
+def _array(nbytes, value=0):
+    return np.full(nbytes, value, np.uint8)
+
+
+def test_eviction_keeps_total_within_budget():
+    cache = ResultCache(max_bytes=1000)
+    for key in range(10):
+        cache.put(key, _array(300))
+        assert cache.nbytes <= cache.max_bytes
+        assert cache.nbytes == sum(cache.get(k).nbytes for k in range(10) if k in cache)
+    assert len(cache) == 3
+    assert cache.evictions == 7
+
+
+def test_least_recently_used_goes_first():
+    cache = ResultCache(max_bytes=900)
+    for key in "abc":
+        cache.put(key, _array(300))
+    cache.get("a")
+    cache.put("d", _array(300))
+    assert "b" not in cache
+    assert all(k in cache for k in "acd")
+
+
+def test_replacing_a_key_updates_the_size():
+    cache = ResultCache(max_bytes=1000)
+    cache.put("a", _array(600))
+    cache.put("a", _array(100))
+    cache.put("b", _array(800))
+    assert cache.nbytes == 900
+    assert len(cache) == 2 and cache.evictions == 0
+
+
+def test_value_larger_than_budget_is_not_stored():
+    cache = ResultCache(max_bytes=1000)
+    cache.put("a", _array(500))
+    cache.put("big", _array(2000))
+    assert "big" not in cache and "a" in cache
+    assert cache.nbytes == 500
+
+
+def test_hit_and_miss_counters():
+    cache = ResultCache(max_bytes=1000)
+    cache.put("a", _array(10))
+    assert cache.get("a") is not None and cache.get("x") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_keys_follow_content_and_specs():
+    img = np.arange(60, dtype=np.uint8).reshape(5, 4, 3)
+    assert content_hash(img) == content_hash(img.copy())
+    changed = img.copy()
+    changed[0, 0, 0] += 1
+    assert content_hash(changed) != content_hash(img)
+    # Pixel sama, bentuk berbeda
+    assert content_hash(img.reshape(4, 5, 3)) != content_hash(img)
+    # Kunci GUI: (hash, tuple spec, skala); spec yang sama -> kunci sama
+    key = (content_hash(img), (ProcessSpec(method="Grayscale"),), 1.0)
+    assert key == (content_hash(img.copy()), (ProcessSpec(method="Grayscale"),), 1.0)
+    assert key != (content_hash(img), (ProcessSpec(method="Grayscale", kernel=5),), 1.0)
@@ -0,0 +1,116 @@
+"""Incremental camera processing: static frames are skipped, patched frames
+must equal a full recompute."""
+import cv2
+import numpy as np
+import pytest
+
+from engine import ProcessSpec
+from incremental import ChangeDetector, IncrementalProcessor, pipeline_halo
+from pipeline import Pipeline
+
+LOCAL_CHAINS = [
+    (ProcessSpec(method="Blurring/Smoothing", kernel=15),),
+    (ProcessSpec(method="Grayscale"), ProcessSpec(method="Morphology (Open)", morph_shape="Ellipse", morph_size=9)),
+    (ProcessSpec(method="Blurring/Smoothing", blur_type="Median Blur", kernel=5),
+     ProcessSpec(method="Sharpen / Contrast")),
+    (ProcessSpec(method="Edge Detection", edge_type="Laplacian"),),
+]
+GLOBAL_CHAINS = [
+    (ProcessSpec(method="Histogram Equalization"),),
+    (ProcessSpec(method="Edge Detection", edge_type="Sobel"),),
+]
+
+
+def _frame():
+    rng = np.random.default_rng(0)
+    return cv2.GaussianBlur(rng.integers(0, 256, (240, 320, 3), dtype=np.uint8), (7, 7), 0)
+
+
+def _changes(frame, count=6):
+    """Frames that each differ from the previous one by one solid rectangle."""
+    rng = np.random.default_rng(1)
+    for _ in range(count):
+        frame = frame.copy()
+        y, x = rng.integers(0, 200), rng.integers(0, 280)
+        frame[y:y + 30, x:x + 35] = rng.integers(0, 256, 3)
+        yield frame
+
+
+def _processor(specs):
+    pipeline = Pipeline()
+
+    def run_full(frame):
+        pipeline.set_stages(specs)
+        return pipeline.run(frame)
+
+    return IncrementalProcessor(threshold=8), run_full
+
+
+@pytest.mark.parametrize("specs", LOCAL_CHAINS + GLOBAL_CHAINS, ids=lambda s: s[-1].method)
+def test_static_frame_returns_none(specs):
+    inc, run_full = _processor(specs)
+    frame = _frame()
+    first = inc.process(frame, specs, run_full)
+    assert first is not None
+    assert inc.process(frame.copy(), specs, run_full) is None
+    assert inc.static_frames == 1
+    assert inc.result is first
+
+
+@pytest.mark.parametrize("specs", LOCAL_CHAINS, ids=lambda s: s[-1].method)
+def test_patched_output_equals_full_recompute(specs):
+    inc, run_full = _processor(specs)
+    inc.process(_frame(), specs, run_full)
+    for frame in _changes(_frame()):
+        out = inc.process(frame, specs, run_full)
+        np.testing.assert_array_equal(out, Pipeline(specs).run(frame))
+    assert inc.partial_frames == 6
+
+
+@pytest.mark.parametrize("specs", GLOBAL_CHAINS, ids=lambda s: s[-1].method)
+def test_global_stages_recompute_in_full(specs):
+    assert pipeline_halo(specs) is None
+    inc, run_full = _processor(specs)
+    inc.process(_frame(), specs, run_full)
+    for frame in _changes(_frame(), 3):
+        np.testing.assert_array_equal(inc.process(frame, specs, run_full), Pipeline(specs).run(frame))
+    assert inc.partial_frames == 0 and inc.full_frames == 4
+
+
+def test_new_specs_and_large_changes_recompute_in_full():
+    specs = LOCAL_CHAINS[0]
+    inc, run_full = _processor(specs)
+    frame = _frame()
+    inc.process(frame, specs, run_full)
+    other = (ProcessSpec(method="Blurring/Smoothing", kernel=5),)
+    _, run_other = _processor(other)
+    np.testing.assert_array_equal(inc.process(frame.copy(), other, run_other), Pipeline(other).run(frame))
+    inverted = 255 - frame
+    np.testing.assert_array_equal(inc.process(inverted, other, run_other), Pipeline(other).run(inverted))
+    assert inc.full_frames == 3 and inc.partial_frames == 0
+
+
+def test_regions_false_disables_patching():
+    specs = LOCAL_CHAINS[0]
+    inc, run_full = _processor(specs)
+    inc.process(_frame(), specs, run_full)
+    frame = next(_changes(_frame()))
+    np.testing.assert_array_equal(inc.process(frame, specs, run_full, regions=False), Pipeline(specs).run(frame))
+    assert inc.partial_frames == 0 and inc.full_frames == 2
+
+
+def test_detector_marks_only_tiles_near_the_change():
+    detector = ChangeDetector(threshold=8, tile=64, factor=8)
+    frame = _frame()
+    detector.reset(frame)
+    assert not detector.changed(frame.copy()).any()
+    # Perubahan di bawah threshold diabaikan
+    assert not detector.changed(cv2.add(frame, 3)).any()
+    moved = frame.copy()
+    moved[130:150, 200:220] = 0
+    grid = detector.changed(moved)
+    assert grid.shape == (4, 5)
+    assert grid[2, 3]
+    assert not grid[0, 0] and not grid[3, 0]
+    # Ukuran berbeda: tidak ada referensi yang bisa dibandingkan
+    assert detector.changed(frame[:100]) is None
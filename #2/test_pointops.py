@@ -0,0 +1,64 @@
+"""Fused point-operation chains must match running every stage on its own."""
+import itertools
+
+import numpy as np
+import pytest
+
+from engine import ProcessSpec, process
+from pipeline import Pipeline
+from pointops import POINT_METHODS, apply_point_ops, compile_lut, point_key
+
+_VARIANTS = [
+    ProcessSpec(method="Image Negative"),
+    ProcessSpec(method="Threshold (Binary)", thresh=90),
+    ProcessSpec(method="Brightness/Contrast Adjustment", brightness=-40, contrast=1.7),
+    ProcessSpec(method="Brightness/Contrast Adjustment", brightness=25.5, contrast=0.6),
+]
+
+
+def _images():
+    rng = np.random.default_rng(0)
+    img = rng.integers(0, 256, (40, 50, 3), dtype=np.uint8)
+    return [img, img[..., 0].copy()]
+
+
+def _stage_by_stage(img, specs):
+    for spec in specs:
+        img = process(img, spec)
+    return img
+
+
+@pytest.mark.parametrize("specs", [c for n in (1, 2, 3) for c in itertools.product(_VARIANTS, repeat=n)],
+                         ids=lambda specs: "+".join(s.method.split()[0] for s in specs))
+def test_fused_chain_matches_stages(specs):
+    for img in _images():
+        np.testing.assert_array_equal(apply_point_ops(img, specs), _stage_by_stage(img, specs))
+
+
+def test_pipeline_fuses_runs_between_other_stages():
+    specs = [_VARIANTS[2], _VARIANTS[0], ProcessSpec(method="Blurring/Smoothing", kernel=5),
+             _VARIANTS[3], _VARIANTS[1], _VARIANTS[0]]
+    for img in _images():
+        pipeline = Pipeline(specs)
+        np.testing.assert_array_equal(pipeline.run(img), _stage_by_stage(img, specs))
+        # Ubah tahap terakhir rangkaian: rangkaian itu dihitung ulang seluruhnya
+        pipeline.set_stage(5, ProcessSpec(method="Threshold (Binary)", thresh=30))
+        np.testing.assert_array_equal(pipeline.run(), _stage_by_stage(img, pipeline.stages))
+
+
+def test_lut_cache_keys_ignore_unrelated_fields():
+    a = ProcessSpec(method="Threshold (Binary)", thresh=90, kernel=3)
+    b = ProcessSpec(method="Threshold (Binary)", thresh=90, kernel=9)
+    assert point_key(a) == point_key(b)
+    assert point_key(a) != point_key(ProcessSpec(method="Threshold (Binary)", thresh=91))
+    keys = (point_key(a),)
+    assert compile_lut(keys) is compile_lut((point_key(b),))
+    assert not compile_lut(keys).flags.writeable
+
+
+def test_every_point_method_has_a_lut():
+    img = _images()[1]
+    for method in POINT_METHODS:
+        spec = ProcessSpec(method=method)
+        lut = compile_lut((point_key(spec),))
+        np.testing.assert_array_equal(lut[img], process(img, spec))
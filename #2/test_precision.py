@@ -0,0 +1,35 @@
+"""Reduced precisions must stay within one level of the float64 reference."""
+from dataclasses import replace
+
+import cv2
+import numpy as np
+import pytest
+
+from engine import PRECISIONS, ProcessSpec, process
+
+_REDUCED = [p for p in PRECISIONS if p != "float64"]
+
+
+def _images():
+    rng = np.random.default_rng(0)
+    noise = (rng.random((180, 240, 3)) * 255).astype(np.uint8)
+    # Noise murni memberi gradien ekstrem, versi blur memberi gradien halus
+    return [noise, cv2.GaussianBlur(noise, (9, 9), 0)]
+
+
+@pytest.mark.parametrize("precision", _REDUCED)
+@pytest.mark.parametrize("k", [1, 3, 5, 7])
+def test_sobel_within_one_level(precision, k):
+    spec = ProcessSpec(method="Edge Detection", edge_type="Sobel", sobel_k=k)
+    for img in _images():
+        ref = process(img, spec).astype(np.int16)
+        out = process(img, replace(spec, precision=precision)).astype(np.int16)
+        assert np.abs(out - ref).max() <= 1
+
+
+@pytest.mark.parametrize("precision", _REDUCED)
+def test_laplacian_exact(precision):
+    spec = ProcessSpec(method="Edge Detection", edge_type="Laplacian")
+    for img in _images():
+        out = process(img, replace(spec, precision=precision))
+        np.testing.assert_array_equal(out, process(img, spec))
@@ -0,0 +1,119 @@
+"""Status codes of the HTTP service: 400 for bad input, 503 when full, 504 on timeout."""
+import base64
+import http.client
+import json
+import threading
+
+import cv2
+import numpy as np
+import pytest
+
+from server import make_server
+
+
+def _start(max_queue):
+    srv = make_server(port=0, workers=1, max_queue=max_queue, timeout=0.2)
+    threading.Thread(target=srv.serve_forever, args=(0.05,), daemon=True).start()
+    return srv
+
+
+def _stop(srv):
+    srv.shutdown()
+    srv.server_close()
+    srv.service.shutdown()
+
+
+@pytest.fixture
+def server():
+    # Satu worker tanpa antrean: satu job yang berjalan sudah membuat server penuh
+    srv = _start(max_queue=0)
+    yield srv
+    _stop(srv)
+
+
+def _png():
+    img = np.zeros((16, 16, 3), np.uint8)
+    return cv2.imencode(".png", img)[1].tobytes()
+
+
+def _post(srv, path, body, headers=None):
+    conn = http.client.HTTPConnection("127.0.0.1", srv.server_address[1], timeout=5)
+    conn.request("POST", path, body, headers or {})
+    resp = conn.getresponse()
+    status, data = resp.status, resp.read()
+    conn.close()
+    return status, data
+
+
+def _block_worker(srv):
+    """Occupy the only pool slot until the returned event is set."""
+    release = threading.Event()
+    srv.service.submit(release.wait, 5)
+    return release
+
+
+def test_process_ok(server):
+    status, data = _post(server, "/process?method=Grayscale", _png())
+    assert status == 200
+    assert cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_UNCHANGED).shape == (16, 16)
+
+
+@pytest.mark.parametrize("query", [
+    "", "method=Nope", "method=Blurring/Smoothing&blur_type=Foo",
+    "method=Edge%20Detection&edge_type=Foo", "method=Grayscale&kernel=abc", "method=Grayscale&format=gif",
+])
+def test_process_bad_spec(server, query):
+    assert _post(server, f"/process?{query}", _png())[0] == 400
+
+
+def test_process_bad_body(server):
+    assert _post(server, "/process?method=Grayscale", b"not an image")[0] == 400
+
+
+@pytest.mark.parametrize("length", ["abc", "-5"])
+def test_bad_content_length(server, length):
+    conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+    conn.putrequest("POST", "/process?method=Grayscale")
+    conn.putheader("Content-Length", length)
+    conn.endheaders()
+    assert conn.getresponse().status == 400
+    conn.close()
+
+
+@pytest.mark.parametrize("payload", [
+    "not json", json.dumps([1, 2]), json.dumps({"spec": {"method": "Grayscale"}}),
+    json.dumps({"images": "abc", "spec": {"method": "Grayscale"}}),
+    json.dumps({"images": [], "spec": ["Grayscale"]}),
+    json.dumps({"images": [], "spec": "Grayscale"}),
+    json.dumps({"images": [], "spec": {"method": "Blurring/Smoothing", "blur_type": "Foo"}}),
+    json.dumps({"images": [], "spec": {"method": "Grayscale"}, "format": 5}),
+])
+def test_batch_bad_body(server, payload):
+    assert _post(server, "/batch", payload)[0] == 400
+
+
+def test_batch_item_errors(server):
+    images = [base64.b64encode(_png()).decode("ascii"), "AAAA"]
+    status, data = _post(server, "/batch", json.dumps({"images": images, "spec": {"method": "Grayscale"}}))
+    results = json.loads(data)["results"]
+    assert status == 200
+    assert "image" in results[0] and "error" in results[1]
+
+
+def test_overloaded_returns_503(server):
+    release = _block_worker(server)
+    try:
+        assert _post(server, "/process?method=Grayscale", _png())[0] == 503
+    finally:
+        release.set()
+
+
+def test_timeout_returns_504():
+    srv = _start(max_queue=1)
+    release = _block_worker(srv)
+    try:
+        # Job kedua menunggu di antrean sampai timeout
+        assert _post(srv, "/process?method=Grayscale", _png())[0] == 504
+    finally:
+        release.set()
+        _stop(srv)
@@ -0,0 +1,34 @@
+"""Tiled processing must match processing the whole image at once."""
+import cv2
+import numpy as np
+import pytest
+
+from engine import BLUR_TYPES, EDGE_TYPES, METHODS, ProcessSpec, process
+from tiled import halo_for, output_shape, process_tiled
+
+# Canny: hysteresis bisa menjalar lebih jauh dari halo (lihat CANNY_HALO)
+_EXACT_EDGES = [e for e in EDGE_TYPES if e != "Canny"]
+
+
+def _image():
+    rng = np.random.default_rng(0)
+    return cv2.GaussianBlur((rng.random((150, 210, 3)) * 255).astype(np.uint8), (5, 5), 0)
+
+
+def _specs():
+    # Setiap metode yang bisa di-tile, dengan sobel_k=1 (halo Sobel terkecil)
+    specs = [ProcessSpec(method=m, edge_type="Sobel", sobel_k=1, blur_engine="exact") for m in METHODS
+             if halo_for(ProcessSpec(method=m)) is not None]
+    specs += [ProcessSpec(method="Edge Detection", edge_type=e, sobel_k=k)
+              for e in _EXACT_EDGES for k in (1, 3, 5, 7)]
+    specs += [ProcessSpec(method="Blurring/Smoothing", blur_type=b, kernel=k, blur_engine="exact")
+              for b in BLUR_TYPES for k in (4, 9)]
+    return list(dict.fromkeys(specs))
+
+
+@pytest.mark.parametrize("spec", _specs(), ids=lambda s: f"{s.method}-{s.edge_type}-{s.blur_type}-k{s.sobel_k}")
+def test_tiled_matches_whole_image(spec):
+    img = _image()
+    out = np.zeros(output_shape(img, spec), np.uint8)
+    process_tiled(img, out, spec, tile_size=64, workers=2)
+    np.testing.assert_array_equal(out, process(img, spec))
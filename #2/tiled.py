@@ -0,0 +1,238 @@
+"""
+Pemrosesan per-tile (out-of-core) untuk gambar yang lebih besar dari RAM.
+
+Input dan output dibaca/ditulis lewat memory map (.npy atau .raw), setiap
+tile diproses dengan halo (overlap) selebar radius kernel sehingga hasilnya
+sama dengan pemrosesan tanpa tile, dan hanya ``max_inflight`` tile yang ada
+di memori pada satu waktu.
+
+Contoh:
+    python tiled.py scan.npy hasil.npy --method "Blurring/Smoothing" --kernel 15 -j 8
+    python tiled.py pano.raw hasil.npy --shape 40000,90000,3 --method "Edge Detection" --edge-type Sobel
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import numpy as np
+
+from batch import add_spec_arguments, spec_from_args
+from engine import (
+    blur_engine_for, magnitude_peak, morph_params, normalize_magnitude, odd_kernel, process, read_image,
+    sobel_magnitude, to_gray, write_image,
+)
+
+TILE_SIZE = 1024
+# Hysteresis Canny bisa menjalar lebih jauh dari halo mana pun; 32 piksel
+# cukup untuk hampir semua kasus, tapi hasilnya tidak dijamin identik.
+CANNY_HALO = 32
+
+
+def halo_for(spec):
+    """Context (pixels) a tile needs around it, or None if the op is not local."""
+    m = spec.method
+    if m in ("Image Negative", "Grayscale", "Threshold (Binary)", "Brightness/Contrast Adjustment"):
+        return 0
+    if m == "Blurring/Smoothing":
+        if blur_engine_for(spec) == "fast":
+            # Engine cepat bekerja pada salinan yang diperkecil: grid sampling
+            # tiap tile berbeda, jadi hasil di batas tile hanya mendekati
+            if spec.blur_type == "Bilateral Filter":
+                return 2 * max(int(spec.bilateral_d) // 4, 1) + 8
+            return odd_kernel(spec.kernel) + 8
+        if spec.blur_type == "Bilateral Filter":
+            return max(int(spec.bilateral_d), 1) // 2
+        if spec.blur_type == "Mean Blur":
+            return max(int(spec.kernel), 1) // 2
+        return odd_kernel(spec.kernel) // 2
+    if m == "Edge Detection":
+        if spec.edge_type == "Canny":
+            return CANNY_HALO
+        if spec.edge_type == "Sobel":
+            # ksize=1 tetap membaca tetangga 3-tap (filter [-1, 0, 1])
+            return max(odd_kernel(spec.sobel_k) // 2, 1)
+        return 1
+    if m in ("Dilation", "Erosion", "Morphology (Open)", "Morphology (Close)"):
+        # Anchor di k // 2: jangkauan ke tiap sisi paling banyak k // 2 per
+        # iterasi; opening/closing menjalankan dua operasi berturut-turut
+        size, iterations = morph_params(spec)
+        passes = 1 if m in ("Dilation", "Erosion") else 2
+        return (size // 2) * iterations * passes
+    if m == "Sharpen / Contrast":
+        return 1
+    return None  # mis. Histogram Equalization: butuh histogram seluruh gambar
+
+
+def _is_sobel(spec):
+    return spec.method == "Edge Detection" and spec.edge_type == "Sobel"
+
+
+def with_halo(src, y0, y1, x0, x1, halo):
+    h, w = src.shape[:2]
+    ya, yb = max(0, y0 - halo), min(h, y1 + halo)
+    xa, xb = max(0, x0 - halo), min(w, x1 + halo)
+    tile = np.ascontiguousarray(src[ya:yb, xa:xb])
+    return tile, (slice(y0 - ya, y0 - ya + (y1 - y0)), slice(x0 - xa, x0 - xa + (x1 - x0)))
+
+
+def process_region(src, spec, y0, y1, x0, x1, halo=None):
+    """Process ``src[y0:y1, x0:x1]`` with ``halo`` pixels of context and return that block.
+
+    At the image border the tile edge is the image edge, so OpenCV's border
+    handling matches the untiled result there as well.
+    """
+    if halo is None:
+        halo = halo_for(spec)
+    tile, core = with_halo(src, y0, y1, x0, x1, halo)
+    return process(tile, spec)[core]
+
+
+def iter_tiles(shape, tile_size=TILE_SIZE):
+    h, w = shape[:2]
+    for y0 in range(0, h, tile_size):
+        for x0 in range(0, w, tile_size):
+            yield y0, min(y0 + tile_size, h), x0, min(x0 + tile_size, w)
+
+
+def _sobel_peak(src, spec, y0, y1, x0, x1, halo):
+    tile, core = with_halo(src, y0, y1, x0, x1, halo)
+    return float(magnitude_peak(sobel_magnitude(to_gray(tile), spec)[core]))
+
+
+def _sobel_tile(src, spec, y0, y1, x0, x1, halo, peak):
+    tile, core = with_halo(src, y0, y1, x0, x1, halo)
+    return normalize_magnitude(sobel_magnitude(to_gray(tile), spec)[core], peak)
+
+
+def _run_tiles(fn, tiles, workers, max_inflight, on_result):
+    """Run ``fn(*tile)`` on a thread pool with at most ``max_inflight`` tiles alive."""
+    tiles = iter(tiles)
+    pending = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while True:
+            for t in tiles:
+                pending[pool.submit(fn, *t)] = t
+                if len(pending) >= max_inflight:
+                    break
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                on_result(pending.pop(fut), fut.result())
+
+
+def output_shape(src, spec):
+    """Shape of the result, probed by processing a small corner of the input."""
+    probe = process(np.ascontiguousarray(src[:8, :8]), spec)
+    return tuple(src.shape[:2]) + tuple(probe.shape[2:])
+
+
+def process_tiled(src, dst, spec, tile_size=TILE_SIZE, workers=None, max_inflight=None, progress=None):
+    """Process array-like ``src`` into ``dst`` tile by tile.
+
+    ``src``/``dst`` can be numpy memmaps, so neither has to fit in RAM. Tiles
+    run on a thread pool (OpenCV releases the GIL) and memory use is bounded
+    by ``max_inflight`` tiles of ``(tile_size + 2*halo)^2`` pixels.
+    Sobel normalises by the global maximum, so it runs in two passes.
+    """
+    halo = halo_for(spec)
+    if halo is None:
+        raise ValueError(f"{spec.method} needs the whole image and cannot be tiled")
+    workers = workers or os.cpu_count() or 1
+    max_inflight = max_inflight or 2 * workers
+    tiles = list(iter_tiles(src.shape, tile_size))
+    total = len(tiles) * (2 if _is_sobel(spec) else 1)
+    done = [0]
+
+    def tick():
+        done[0] += 1
+        if progress is not None:
+            progress(done[0], total)
+
+    if _is_sobel(spec):
+        peaks = []
+
+        def keep_peak(t, peak):
+            peaks.append(peak)
+            tick()
+
+        _run_tiles(lambda *t: _sobel_peak(src, spec, *t, halo), tiles, workers, max_inflight, keep_peak)
+        peak = max(peaks)
+        fn = lambda *t: _sobel_tile(src, spec, *t, halo, peak)
+    else:
+        fn = lambda *t: process_region(src, spec, *t, halo)
+
+    def store(t, block):
+        y0, y1, x0, x1 = t
+        dst[y0:y1, x0:x1] = block
+        tick()
+
+    _run_tiles(fn, tiles, workers, max_inflight, store)
+    if hasattr(dst, "flush"):
+        dst.flush()
+    return dst
+
+
+def parse_shape(text):
+    return tuple(int(v) for v in text.split(","))
+
+
+def open_input(path, shape=None):
+    """Memory-map a .npy/.raw file; other image formats are decoded into RAM."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".npy":
+        return np.load(path, mmap_mode="r")
+    if ext == ".raw":
+        if shape is None:
+            raise ValueError("--shape is required for .raw input")
+        return np.memmap(path, dtype=np.uint8, mode="r", shape=shape)
+    img = read_image(path)
+    if img is None:
+        raise ValueError(f"Cannot decode {path}")
+    return img
+
+
+def open_output(path, shape):
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".npy":
+        return np.lib.format.open_memmap(path, mode="w+", dtype=np.uint8, shape=shape)
+    if ext == ".raw":
+        return np.memmap(path, dtype=np.uint8, mode="w+", shape=shape)
+    return np.empty(shape, dtype=np.uint8)  # ditulis sebagai gambar di akhir
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tiled, out-of-core processing of very large images")
+    parser.add_argument("input", help=".npy, .raw (with --shape) or a regular image file")
+    parser.add_argument("output", help=".npy, .raw or a regular image file")
+    parser.add_argument("--shape", type=parse_shape, default=None, help="H,W[,C] of a .raw input")
+    parser.add_argument("--tile", type=int, default=TILE_SIZE, help="tile size in pixels")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count(), help="worker threads")
+    parser.add_argument("--max-inflight", type=int, default=None,
+                        help="max tiles in memory at once (default 2 x workers)")
+    add_spec_arguments(parser)
+    args = parser.parse_args(argv)
+
+    spec = spec_from_args(args)
+    if halo_for(spec) is None:
+        parser.error(f"{spec.method} needs the whole image and cannot be tiled")
+    src = open_input(args.input, args.shape)
+    dst = open_output(args.output, output_shape(src, spec))
+    start = time.perf_counter()
+
+    def progress(done, total):
+        sys.stderr.write(f"\r[{done}/{total}] tiles")
+        sys.stderr.flush()
+
+    process_tiled(src, dst, spec, args.tile, args.workers, args.max_inflight, progress)
+    sys.stderr.write("\n")
+    if not isinstance(dst, np.memmap):
+        write_image(args.output, dst)
+    print(f"Done in {time.perf_counter() - start:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
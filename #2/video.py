@@ -0,0 +1,240 @@
+"""
+Pemrosesan file video / urutan gambar tanpa GUI.
+
+Decode, proses dan encode berjalan di thread terpisah yang dihubungkan
+queue berukuran tetap, sehingga pemanggilan OpenCV (yang melepas GIL)
+saling tumpang-tindih dan memori tetap terbatas.
+
+Contoh:
+    python video.py input.mp4 output.mp4 --method "Edge Detection" --edge-type Canny
+    python video.py "frames/*.png" "out/frame_%06d.png" --method "Image Negative" -j 4
+"""
+import argparse
+import glob
+import os
+import queue
+import sys
+import threading
+import time
+
+import cv2
+
+from batch import add_spec_arguments, spec_from_args
+from engine import read_image, write_image
+from pipeline import Pipeline
+
+_DONE = object()
+
+
+class ImageSequenceSource:
+    """cv2.VideoCapture-like reader over a sorted list of image files."""
+
+    def __init__(self, pattern, fps=30.0):
+        if os.path.isdir(pattern):
+            pattern = os.path.join(glob.escape(pattern), "*")
+        self.paths = sorted(glob.glob(pattern))
+        self.fps = fps
+        self._index = 0
+
+    def isOpened(self):
+        return self._index < len(self.paths)
+
+    def read(self):
+        while self._index < len(self.paths):
+            path = self.paths[self._index]
+            self._index += 1
+            frame = read_image(path)
+            if frame is not None:
+                return True, frame
+        return False, None
+
+    def get(self, prop):
+        if prop == cv2.CAP_PROP_FPS:
+            return self.fps
+        if prop == cv2.CAP_PROP_FRAME_COUNT:
+            return len(self.paths)
+        return 0.0
+
+    def release(self):
+        pass
+
+
+class ImageSequenceSink:
+    """Writes frames to a printf-style pattern such as ``out/frame_%06d.png``."""
+
+    def __init__(self, pattern):
+        self.pattern = pattern
+        self._index = 0
+
+    def write(self, frame):
+        path = self.pattern % self._index
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        write_image(path, frame)
+        self._index += 1
+
+    def release(self):
+        pass
+
+
+class VideoSink:
+    """cv2.VideoWriter opened lazily from the first frame's size and channels."""
+
+    def __init__(self, path, fps, fourcc="mp4v"):
+        self.path = path
+        self.fps = fps
+        self.fourcc = fourcc
+        self._writer = None
+
+    def write(self, frame):
+        if self._writer is None:
+            h, w = frame.shape[:2]
+            self._writer = cv2.VideoWriter(self.path, cv2.VideoWriter_fourcc(*self.fourcc),
+                                           self.fps, (w, h), frame.ndim == 3)
+            if not self._writer.isOpened():
+                raise IOError(f"Cannot open video writer for {self.path}")
+        self._writer.write(frame)
+
+    def release(self):
+        if self._writer is not None:
+            self._writer.release()
+
+
+def open_source(source):
+    """Camera index, video file/URL, image directory or glob pattern."""
+    if str(source).isdigit():
+        return cv2.VideoCapture(int(source))
+    if os.path.isdir(source) or glob.has_magic(source):
+        return ImageSequenceSource(source)
+    return cv2.VideoCapture(source)
+
+
+def open_sink(target, fps, fourcc="mp4v"):
+    if "%" in target:
+        return ImageSequenceSink(target)
+    return VideoSink(target, fps, fourcc)
+
+
+def run_video(cap, sink, specs, workers=1, queue_size=8, max_frames=None, progress=None):
+    """Stream ``cap`` through the pipeline ``specs`` into ``sink``.
+
+    One decode thread, ``workers`` processing threads (each with its own
+    Pipeline) and the calling thread as encoder, joined by bounded queues.
+    Output order matches input order. Returns a stats dict with the achieved
+    FPS.
+    """
+    q_in = queue.Queue(maxsize=queue_size)
+    q_out = queue.Queue(maxsize=queue_size)
+    errors = []
+    stop = threading.Event()
+
+    def decode():
+        try:
+            index = 0
+            while not stop.is_set() and (max_frames is None or index < max_frames):
+                ok, frame = cap.read()
+                if not ok:
+                    break
+                q_in.put((index, frame))
+                index += 1
+        except Exception as e:
+            errors.append(e)
+        finally:
+            for _ in range(workers):
+                q_in.put(_DONE)
+
+    def work():
+        pipeline = Pipeline(specs)
+        try:
+            while True:
+                item = q_in.get()
+                if item is _DONE:
+                    break
+                index, frame = item
+                q_out.put((index, pipeline.run(frame)))
+        except Exception as e:
+            errors.append(e)
+            stop.set()
+            # kosongkan q_in supaya thread decode tidak macet
+            while q_in.get() is not _DONE:
+                pass
+        finally:
+            q_out.put(_DONE)
+
+    threads = [threading.Thread(target=decode, name="decode", daemon=True)]
+    threads += [threading.Thread(target=work, name=f"process-{i}", daemon=True) for i in range(workers)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+
+    # Encoder: urutkan ulang hasil berdasarkan indeks frame
+    pending = {}
+    next_index = 0
+    finished = 0
+    try:
+        while finished < workers:
+            item = q_out.get()
+            if item is _DONE:
+                finished += 1
+                continue
+            pending[item[0]] = item[1]
+            while next_index in pending:
+                if not errors:
+                    sink.write(pending.pop(next_index))
+                else:
+                    pending.pop(next_index)
+                next_index += 1
+                if progress is not None:
+                    progress(next_index, time.perf_counter() - start)
+    except Exception as e:
+        errors.append(e)
+        stop.set()
+        while finished < workers:
+            if q_out.get() is _DONE:
+                finished += 1
+    finally:
+        for t in threads:
+            t.join()
+        sink.release()
+
+    if errors:
+        raise errors[0]
+    elapsed = time.perf_counter() - start
+    return {"frames": next_index, "seconds": elapsed, "fps": next_index / elapsed if elapsed > 0 else 0.0}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless video / image-sequence processing")
+    parser.add_argument("source", help="video file, camera index, image directory or glob")
+    parser.add_argument("output", help="video file, or a pattern like out/frame_%%06d.png")
+    parser.add_argument("-j", "--workers", type=int, default=1, help="processing threads")
+    parser.add_argument("--queue-size", type=int, default=8, help="frames buffered between stages")
+    parser.add_argument("--fourcc", default="mp4v", help="FOURCC of the output video")
+    parser.add_argument("--fps", type=float, default=None, help="output FPS (default: source FPS)")
+    parser.add_argument("--max-frames", type=int, default=None)
+    add_spec_arguments(parser)
+    args = parser.parse_args(argv)
+
+    spec = spec_from_args(args)
+    cap = open_source(args.source)
+    if not cap.isOpened():
+        parser.error(f"Cannot open source {args.source}")
+    src_fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    sink = open_sink(args.output, args.fps or src_fps, args.fourcc)
+
+    def progress(frames, elapsed):
+        if frames % 30 == 0:
+            sys.stderr.write(f"\r{frames} frames, {frames / elapsed:.1f} FPS")
+            sys.stderr.flush()
+
+    try:
+        stats = run_video(cap, sink, (spec,), args.workers, args.queue_size, args.max_frames, progress)
+    finally:
+        cap.release()
+    sys.stderr.write("\n")
+    print(f"{stats['frames']} frames in {stats['seconds']:.2f}s: {stats['fps']:.1f} FPS "
+          f"({stats['fps'] / src_fps:.1f}x real time at {src_fps:.0f} FPS)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())